@@ -1,5 +1,7 @@
 from django.contrib.auth.models import AbstractUser, BaseUserManager
+from django.contrib.postgres.indexes import OpClass
 from django.db import models
+from django.db.models.functions import Upper
 
 
 class CustomUserManager(BaseUserManager):
@@ -62,6 +64,13 @@ class CustomUser(AbstractUser):
     USERNAME_FIELD = 'email'
     REQUIRED_FIELDS = ['full_name']  # Fields required when creating superuser (besides email)
     
+    class Meta(AbstractUser.Meta):
+        indexes = [
+            # Admin email and username prefix search (istartswith) runs as UPPER(column) LIKE UPPER('x%')
+            models.Index(OpClass(Upper('email'), name='varchar_pattern_ops'), name='user_email_upper_prefix_idx'),
+            models.Index(OpClass(Upper('username'), name='varchar_pattern_ops'), name='user_username_upper_prefix_idx'),
+        ]
+    
     def __str__(self):
         return f"{self.full_name} ({self.email})"
     
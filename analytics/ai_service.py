@@ -6,6 +6,7 @@ Uses Hugging Face Inference API for text analysis
 import os
 from typing import List, Dict, Any
 from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from django.conf import settings
 from huggingface_hub import InferenceClient
 import logging
@@ -13,6 +14,10 @@ import logging
 logger = logging.getLogger(__name__)
 
 
+# Zero-shot classification requests sent to the Inference API at the same time
+CLASSIFICATION_WORKERS = 8
+
+
 class ClaimAnalyticsAI:
     """
     AI-powered analytics service for claim insights
@@ -93,6 +98,23 @@ class ClaimAnalyticsAI:
             logger.error(f"Error in zero-shot classification: {e}")
             return {}
     
+    def classify_texts(self, texts: List[str], categories: List[str]) -> List[Dict[str, float]]:
+        """
+        Classify several texts into the given categories
+        Requests run concurrently (each one is a network round-trip) and identical
+        texts are classified once; scores are returned in the order of `texts`
+        """
+        unique_texts = list(dict.fromkeys(texts))
+        if not unique_texts:
+            return []
+        
+        workers = min(CLASSIFICATION_WORKERS, len(unique_texts))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            results = executor.map(lambda text: self.classify_text(text, categories), unique_texts)
+            scores_by_text = dict(zip(unique_texts, results))
+        
+        return [scores_by_text[text] for text in texts]
+    
     def analyze_claim_reasons(self, claims_data: List[Dict]) -> Dict[str, Any]:
         """
         Analyze claim descriptions and categorize reasons
@@ -103,13 +125,16 @@ class ClaimAnalyticsAI:
         category_counts = Counter()
         category_products = {}
         
-        for claim in claims_data:
-            # Combine issue summary and description for better classification
-            text = f"{claim['issue_summary']} {claim['detailed_description']}"
-            
-            # Classify the claim
-            scores = self.classify_text(text, self.claim_categories)
-            
+        # Combine issue summary and description for better classification
+        texts = [
+            f"{claim['issue_summary']} {claim['detailed_description']}"
+            for claim in claims_data
+        ]
+        
+        # Classify all claims
+        all_scores = self.classify_texts(texts, self.claim_categories)
+        
+        for claim, scores in zip(claims_data, all_scores):
             if scores:
                 # Get the top category
                 top_category = max(scores.items(), key=lambda x: x[1])[0]
@@ -146,16 +171,19 @@ class ClaimAnalyticsAI:
         category_counts = Counter()
         category_examples = {}
         
+        # Get all notes for each claim (claims without notes are skipped)
+        claims_with_notes = []
+        notes_texts = []
         for claim in rejected_claims_data:
-            # Get all notes for the claim
             notes_text = " ".join(claim.get('notes', []))
-            
-            if not notes_text:
-                continue
-            
-            # Classify the rejection reason
-            scores = self.classify_text(notes_text, self.rejection_categories)
-            
+            if notes_text:
+                claims_with_notes.append(claim)
+                notes_texts.append(notes_text)
+        
+        # Classify the rejection reasons
+        all_scores = self.classify_texts(notes_texts, self.rejection_categories)
+        
+        for claim, scores in zip(claims_with_notes, all_scores):
             if scores:
                 # Get the top category
                 top_category = max(scores.items(), key=lambda x: x[1])[0]
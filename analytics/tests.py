@@ -1,3 +1,42 @@
-from django.test import TestCase
+from django.test import SimpleTestCase, override_settings
+from .ai_service import ClaimAnalyticsAI
 
-# Create your tests here.
+
+class KeywordClaimAnalyticsAI(ClaimAnalyticsAI):
+    """Scores a text 1.0 for each category it mentions, and records the texts it classified"""
+
+    def __init__(self):
+        super().__init__()
+        # Any client enables the analysis; it is never called since classify_text is overridden
+        self.client = object()
+        self.classified = []
+
+    def classify_text(self, text, categories):
+        self.classified.append(text)
+        return {category: 1.0 for category in categories if category.lower() in text.lower()}
+
+
+@override_settings(HUGGINGFACE_API_KEY=None)
+class ClassifyTextsTests(SimpleTestCase):
+    """Claims are classified concurrently, once per distinct text"""
+
+    def test_scores_follow_text_order(self):
+        ai = KeywordClaimAnalyticsAI()
+        texts = ['Water damage', 'Overheating', 'Water damage']
+        scores = ai.classify_texts(texts, ai.claim_categories)
+        self.assertEqual(scores, [{'Water damage': 1.0}, {'Overheating': 1.0}, {'Water damage': 1.0}])
+        self.assertCountEqual(ai.classified, ['Water damage', 'Overheating'])
+
+    def test_no_texts(self):
+        self.assertEqual(KeywordClaimAnalyticsAI().classify_texts([], ['Other']), [])
+
+    def test_rejections_without_notes_are_skipped(self):
+        ai = KeywordClaimAnalyticsAI()
+        analysis = ai.analyze_rejection_reasons([
+            {'claim_number': 'CLM-2026-001', 'product_name': 'Phone', 'notes': ['Warranty expired last year']},
+            {'claim_number': 'CLM-2026-002', 'product_name': 'Tablet', 'notes': []},
+        ])
+        self.assertEqual(ai.classified, ['Warranty expired last year'])
+        self.assertEqual(analysis['rejection_reasons'][0]['examples'], [
+            {'claim_number': 'CLM-2026-001', 'product': 'Phone'}
+        ])
@@ -20,7 +20,7 @@ class ClaimAttachmentInline(admin.TabularInline):
 class ClaimAdmin(admin.ModelAdmin):
     list_display = ['claim_number', 'get_product', 'get_customer', 'get_assigned_to', 'status', 'priority', 'category', 'estimated_cost', 'submitted_at']
     list_filter = ['status', 'priority', 'category', 'submitted_at']
-    search_fields = ['claim_number', 'issue_summary', 'warranty__receipt_item__product_name', 'warranty__receipt_item__receipt__customer__email']
+    search_fields = ['claim_number', 'issue_summary', 'warranty__receipt_item__product_name', 'warranty__customer__email']
     ordering = ['-submitted_at']
     date_hierarchy = 'submitted_at'
     readonly_fields = ['claim_number', 'submitted_at', 'updated_at', 'get_customer', 'get_retailer', 'get_product', 'get_assigned_to']
@@ -34,9 +34,9 @@ class ClaimAdmin(admin.ModelAdmin):
             'warranty',
             'warranty__receipt_item',
             'warranty__receipt_item__receipt',
-            'warranty__receipt_item__receipt__customer',
-            'warranty__receipt_item__receipt__retailer',
-            'warranty__receipt_item__receipt__store',
+            'warranty__customer',
+            'warranty__retailer',
+            'warranty__store',
             'created_by'
         ).prefetch_related('notes', 'attachments')
     
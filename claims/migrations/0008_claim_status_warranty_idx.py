@@ -0,0 +1,17 @@
+# Generated by Django 5.2.7 on 2026-10-16 04:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('claims', '0007_delete_claimtimeline'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='claim',
+            index=models.Index(fields=['status', 'warranty'], name='claim_status_warranty_idx'),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.7 on 2026-10-16 04:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('claims', '0008_claim_status_warranty_idx'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='claim',
+            index=models.Index(fields=['status', 'submitted_at'], name='claim_status_submitted_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='claim',
+            index=models.Index(fields=['status', 'updated_at'], name='claim_status_updated_idx'),
+        ),
+    ]
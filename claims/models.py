@@ -82,6 +82,13 @@ class Claim(models.Model):
     
     class Meta:
         ordering = ['-submitted_at']
+        indexes = [
+            # Status-filtered claim counts per warranty (store statistics)
+            models.Index(fields=['status', 'warranty'], name='claim_status_warranty_idx'),
+            # Dashboard open claims and resolution time windows
+            models.Index(fields=['status', 'submitted_at'], name='claim_status_submitted_idx'),
+            models.Index(fields=['status', 'updated_at'], name='claim_status_updated_idx'),
+        ]
 
 
 class ClaimNote(models.Model):
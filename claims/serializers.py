@@ -2,6 +2,7 @@ from rest_framework import serializers
 from .models import Claim, ClaimNote, ClaimAttachment
 from warranties.serializers import WarrantyListSerializer
 from warranties.models import Warranty
+from django.utils import timezone
 from accounts.serializers import UserSerializer
 from .ai_priority import priority_detector
 import logging
@@ -129,14 +130,13 @@ class ClaimCreateSerializer(serializers.ModelSerializer):
     
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        from warranties.models import Warranty
         
         # Create the warranty_id field dynamically
         if 'request' in self.context:
             user = self.context['request'].user
             if user.role == 'customer':
                 # Customers can only create claims for their own warranties
-                queryset = Warranty.objects.filter(receipt_item__receipt__customer=user)
+                queryset = Warranty.objects.filter(customer=user)
             else:
                 # Retailers and admins can create claims for any warranty
                 queryset = Warranty.objects.all()
@@ -213,15 +213,12 @@ class CustomerClaimCreateSerializer(serializers.ModelSerializer):
     
     def validate_warranty_id(self, value):
         """Validate warranty belongs to customer and is active"""
-        from warranties.models import Warranty
-        from django.utils import timezone
-        
         user = self.context['request'].user
         
         try:
             warranty = Warranty.objects.select_related('receipt_item__receipt').get(
                 id=value,
-                receipt_item__receipt__customer=user
+                customer=user
             )
             
             # Check if warranty is active
@@ -234,8 +231,6 @@ class CustomerClaimCreateSerializer(serializers.ModelSerializer):
             raise serializers.ValidationError('Warranty not found or does not belong to you')
     
     def create(self, validated_data):
-        from warranties.models import Warranty
-        
         warranty_id = validated_data.pop('warranty_id')
         warranty = Warranty.objects.get(id=warranty_id)
         
@@ -258,7 +253,7 @@ class CustomerClaimListSerializer(serializers.ModelSerializer):
     """Customer claims list"""
     product_name = serializers.ReadOnlyField()
     product_model = serializers.CharField(source='warranty.receipt_item.model', read_only=True)
-    store_name = serializers.CharField(source='warranty.receipt_item.receipt.store.name', read_only=True)
+    store_name = serializers.CharField(source='warranty.store.name', read_only=True)
     
     class Meta:
         model = Claim
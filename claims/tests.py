@@ -1,3 +1,72 @@
+from datetime import date
+
+from django.contrib.auth import get_user_model
 from django.test import TestCase
+from rest_framework.test import APIClient
+from receipts.models import Receipt, ReceiptItem
+from store.models import Store
+from warranties.models import Warranty
+from .models import Claim
+
+User = get_user_model()
+
+
+def create_user(email, role):
+    return User.objects.create_user(email, email.split('@')[0].title(), 'pass', role=role)
+
+
+def create_store(name='Store'):
+    return Store.objects.create(name=name, phone_number='1', email='store@example.com', address='Street 1')
+
+
+def create_claim(store, retailer, customer, status='In Review'):
+    receipt = Receipt.objects.create(store=store, retailer=retailer, customer=customer, total=100, date=date(2026, 1, 10))
+    item = ReceiptItem.objects.create(receipt=receipt, product_name='Phone', price=100)
+    warranty = Warranty.objects.create(
+        receipt_item=item, coverage_period_months=12, provider='Maker', coverage_terms='Hardware',
+        purchase_date=date(2026, 1, 10), expiry_date=date(2027, 1, 10)
+    )
+    return Claim.objects.create(
+        warranty=warranty, issue_summary='Broken', detailed_description='Screen broke', status=status
+    )
+
+
+class ClaimListTests(TestCase):
+    """Claim lists are scoped by the customer and retailer copied onto the warranty"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.store = create_store()
+        cls.retailer = create_user('retailer@example.com', 'retailer')
+        cls.other_retailer = create_user('other-retailer@example.com', 'retailer')
+        cls.customer = create_user('customer@example.com', 'customer')
+        cls.other_customer = create_user('other-customer@example.com', 'customer')
+        cls.claim = create_claim(cls.store, cls.retailer, cls.customer)
+        cls.other_claim = create_claim(cls.store, cls.other_retailer, cls.other_customer, status='Approved')
+
+    def setUp(self):
+        self.client = APIClient()
+
+    def test_retailer_sees_own_claims(self):
+        self.client.force_authenticate(self.retailer)
+        response = self.client.get('/api/claims/')
+        self.assertEqual([claim['id'] for claim in response.data['results']], [self.claim.id])
+        self.assertEqual(response.data['statistics']['pending_review'], 1)
+        self.assertEqual(response.data['statistics']['approved'], 0)
+
+    def test_customer_sees_own_claims(self):
+        self.client.force_authenticate(self.other_customer)
+        response = self.client.get('/api/claims/')
+        self.assertEqual([claim['id'] for claim in response.data['results']], [self.other_claim.id])
+        self.assertEqual(response.data['statistics']['approved'], 1)
+
+    def test_customer_claim_list_store_name(self):
+        self.client.force_authenticate(self.customer)
+        response = self.client.get('/api/claims/my/')
+        self.assertEqual([claim['id'] for claim in response.data], [self.claim.id])
+        self.assertEqual(response.data[0]['store_name'], 'Store')
 
-# Create your tests here.
+    def test_retailer_cannot_open_other_retailers_claim(self):
+        self.client.force_authenticate(self.retailer)
+        response = self.client.get(f'/api/claims/{self.other_claim.pk}/')
+        self.assertEqual(response.status_code, 404)
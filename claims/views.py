@@ -47,12 +47,13 @@ class IsRetailerOrAdminForUpdate(permissions.BasePermission):
             return True
         
         # Retailers can manage claims for their warranties
+        # (warranty foreign key ids are compared, so no User is loaded)
         if user.role == 'retailer':
-            return obj.retailer == user
+            return obj.warranty.retailer_id == user.id
         
         # Customers can view and upload attachments to their own claims
         if user.role == 'customer':
-            return obj.customer == user
+            return obj.warranty.customer_id == user.id
         
         return False
 
@@ -70,9 +71,9 @@ class ClaimViewSet(viewsets.ModelViewSet):
             'warranty',
             'warranty__receipt_item',
             'warranty__receipt_item__receipt',
-            'warranty__receipt_item__receipt__customer',
-            'warranty__receipt_item__receipt__retailer',
-            'warranty__receipt_item__receipt__store',
+            'warranty__customer',
+            'warranty__retailer',
+            'warranty__store',
             'created_by'
         ).prefetch_related('notes', 'attachments')
         
@@ -80,9 +81,9 @@ class ClaimViewSet(viewsets.ModelViewSet):
         if user.role == 'admin':
             pass  # Admins see all
         elif user.role == 'retailer':
-            queryset = queryset.filter(warranty__receipt_item__receipt__retailer=user)
+            queryset = queryset.filter(warranty__retailer=user)
         elif user.role == 'customer':
-            queryset = queryset.filter(warranty__receipt_item__receipt__customer=user)
+            queryset = queryset.filter(warranty__customer=user)
         else:
             return Claim.objects.none()
         
@@ -98,10 +99,10 @@ class ClaimViewSet(viewsets.ModelViewSet):
                 Q(warranty__receipt_item__model__icontains=search) |
                 Q(warranty__receipt_item__serial_number__icontains=search) |
                 Q(warranty__receipt_item__imei__icontains=search) |
-                Q(warranty__receipt_item__receipt__customer__email__icontains=search) |
-                Q(warranty__receipt_item__receipt__customer__first_name__icontains=search) |
-                Q(warranty__receipt_item__receipt__customer__last_name__icontains=search) |
-                Q(warranty__receipt_item__receipt__customer__username__icontains=search)
+                Q(warranty__customer__email__icontains=search) |
+                Q(warranty__customer__first_name__icontains=search) |
+                Q(warranty__customer__last_name__icontains=search) |
+                Q(warranty__customer__username__icontains=search)
             )
         
         # Apply status filter
@@ -164,9 +165,9 @@ class ClaimViewSet(viewsets.ModelViewSet):
         if user.role == 'admin':
             stats_queryset = Claim.objects.all()
         elif user.role == 'retailer':
-            stats_queryset = Claim.objects.filter(warranty__receipt_item__receipt__retailer=user)
+            stats_queryset = Claim.objects.filter(warranty__retailer=user)
         elif user.role == 'customer':
-            stats_queryset = Claim.objects.filter(warranty__receipt_item__receipt__customer=user)
+            stats_queryset = Claim.objects.filter(warranty__customer=user)
         else:
             stats_queryset = Claim.objects.none()
         
@@ -446,9 +447,10 @@ class CustomerClaimListView(generics.ListAPIView):
             return Claim.objects.none()
         
         return Claim.objects.filter(
-            warranty__receipt_item__receipt__customer=user
+            warranty__customer=user
         ).select_related(
-            'warranty__receipt_item__receipt__store'
+            'warranty__receipt_item',
+            'warranty__store'
         ).order_by('-submitted_at')
 
 
@@ -467,14 +469,14 @@ class CustomerClaimDetailView(generics.RetrieveAPIView):
             return Claim.objects.none()
         
         return Claim.objects.filter(
-            warranty__receipt_item__receipt__customer=user
+            warranty__customer=user
         ).select_related(
             'warranty',
             'warranty__receipt_item',
             'warranty__receipt_item__receipt',
-            'warranty__receipt_item__receipt__customer',
-            'warranty__receipt_item__receipt__retailer',
-            'warranty__receipt_item__receipt__store',
+            'warranty__customer',
+            'warranty__retailer',
+            'warranty__store',
             'created_by'
         ).prefetch_related('notes', 'attachments')
 
@@ -499,7 +501,7 @@ class CustomerClaimAddAttachmentView(generics.CreateAPIView):
         try:
             claim = Claim.objects.select_related('warranty__receipt_item__receipt').get(
                 id=claim_id,
-                warranty__receipt_item__receipt__customer=user
+                warranty__customer=user
             )
         except Claim.DoesNotExist:
             return Response({'error': 'Claim not found or does not belong to you'}, status=status.HTTP_404_NOT_FOUND)
@@ -211,6 +211,21 @@ MEDIA_ROOT = os.path.join(BASE_DIR, "media")
 HUGGINGFACE_API_KEY = os.environ.get('HF_TOKEN', None)
 
 
+# Cache shared by every worker, so cached responses and statistics invalidated
+# on one worker are gone for all of them. Set REDIS_URL to point at the Redis server
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': os.environ.get('REDIS_URL', 'redis://127.0.0.1:6379/1'),
+    }
+}
+
+
+# Warranty search: full-text prefix search on Warranty.search_vector when enabled,
+# substring (icontains) search otherwise. Set WARRANTY_FULL_TEXT_SEARCH=1 to enable
+WARRANTY_FULL_TEXT_SEARCH = os.environ.get('WARRANTY_FULL_TEXT_SEARCH', '') == '1'
+
+
 CORS_ALLOW_ALL_ORIGINS = True
 CORS_ALLOW_CREDENTIALS = True
 
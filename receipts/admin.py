@@ -1,5 +1,7 @@
 from django.contrib import admin
+from django.db.models import Exists, OuterRef
 from .models import Receipt, ReceiptItem
+from warranties.models import Warranty
 
 class ReceiptItemInline(admin.TabularInline):
     model = ReceiptItem
@@ -55,10 +57,12 @@ class HasWarrantyFilter(admin.SimpleListFilter):
         )
     
     def queryset(self, request, queryset):
+        # EXISTS probe of the unique receipt_item_id index; needs no annotation on the queryset
+        has_warranty = Exists(Warranty.objects.filter(receipt_item=OuterRef('pk')))
         if self.value() == 'yes':
-            return queryset.filter(warranty__isnull=False)
+            return queryset.filter(has_warranty)
         if self.value() == 'no':
-            return queryset.filter(warranty__isnull=True)
+            return queryset.filter(~has_warranty)
 
 @admin.register(ReceiptItem)
 class ReceiptItemAdmin(admin.ModelAdmin):
@@ -67,7 +71,13 @@ class ReceiptItemAdmin(admin.ModelAdmin):
     search_fields = ['product_name', 'model', 'serial_number', 'imei', 'receipt__receipt_number']
     autocomplete_fields = ['receipt']
     
+    def get_queryset(self, request):
+        """Annotate warranty existence with an EXISTS probe of the unique receipt_item_id index"""
+        return super().get_queryset(request).annotate(
+            has_warranty_annotated=Exists(Warranty.objects.filter(receipt_item=OuterRef('pk')))
+        )
+    
     @admin.display(description='Has Warranty', boolean=True)
     def has_warranty(self, obj):
         """Show if this receipt item has a warranty registered"""
-        return hasattr(obj, 'warranty')
+        return obj.has_warranty_annotated
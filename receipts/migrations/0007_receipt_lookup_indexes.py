@@ -0,0 +1,36 @@
+# Generated by Django 5.2.7 on 2026-10-16 04:29
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('receipts', '0006_alter_receipt_options'),
+        ('store', '0004_store_search_trgm_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='receipt',
+            index=models.Index(fields=['customer', '-date', '-id'], name='receipt_customer_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='receipt',
+            index=models.Index(fields=['retailer', '-date', '-id'], name='receipt_retailer_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='receipt',
+            index=models.Index(fields=['store', '-date'], name='receipt_store_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='receiptitem',
+            index=models.Index(fields=['receipt', 'warranty_expiry'], name='ri_receipt_warr_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='receiptitem',
+            index=models.Index(condition=models.Q(('warranty_expiry__isnull', False)), fields=['warranty_expiry'], name='ri_warr_notnull'),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.7 on 2026-10-16 04:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('receipts', '0007_receipt_lookup_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='receiptitem',
+            index=models.Index(fields=['serial_number'], name='ri_serial_number_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='receiptitem',
+            index=models.Index(fields=['imei'], name='ri_imei_idx'),
+        ),
+    ]
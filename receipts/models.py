@@ -1,4 +1,5 @@
 from django.db import models
+from django.db.models import Q
 from django.contrib.auth import get_user_model
 from store.models import Store
 
@@ -41,6 +42,11 @@ class Receipt(models.Model):
     
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['customer', '-date', '-id'], name='receipt_customer_date_idx'),
+            models.Index(fields=['retailer', '-date', '-id'], name='receipt_retailer_date_idx'),
+            models.Index(fields=['store', '-date'], name='receipt_store_date_idx'),
+        ]
 
 
 class ReceiptItem(models.Model):
@@ -66,3 +72,16 @@ class ReceiptItem(models.Model):
     @property
     def item_total(self):
         return self.price * self.quantity
+    
+    class Meta:
+        indexes = [
+            models.Index(fields=['receipt', 'warranty_expiry'], name='ri_receipt_warr_idx'),
+            models.Index(
+                fields=['warranty_expiry'],
+                condition=Q(warranty_expiry__isnull=False),
+                name='ri_warr_notnull'
+            ),
+            # Exact serial number / IMEI lookups from the warranty search
+            models.Index(fields=['serial_number'], name='ri_serial_number_idx'),
+            models.Index(fields=['imei'], name='ri_imei_idx'),
+        ]
@@ -3,6 +3,7 @@ from .models import Receipt, ReceiptItem
 from store.serializers import StoreSerializer
 from accounts.serializers import UserSerializer
 from store.models import Store
+from warranties.models import Warranty
 from django.contrib.auth import get_user_model
 from django.utils import timezone
 from datetime import timedelta
@@ -38,8 +39,11 @@ class ReceiptItemWithReceiptSerializer(serializers.ModelSerializer):
         ]
     
     def get_has_warranty(self, obj):
-        """Check if this item has a warranty"""
-        return hasattr(obj, 'warranty')
+        """Check if this item has a warranty (from annotation when available)"""
+        has_warranty = getattr(obj, 'has_warranty_annotated', None)
+        if has_warranty is None:
+            has_warranty = hasattr(obj, 'warranty')
+        return has_warranty
 
 
 class ReceiptSerializer(serializers.ModelSerializer):
@@ -135,7 +139,6 @@ class CustomerReceiptItemSerializer(serializers.ModelSerializer):
     
     def get_warranty_days_left(self, obj):
         if obj.warranty_expiry:
-            from django.utils import timezone
             today = timezone.now().date()
             if obj.warranty_expiry >= today:
                 return (obj.warranty_expiry - today).days
@@ -163,7 +166,6 @@ class CustomerReceiptListSerializer(serializers.ModelSerializer):
     
     def get_warranty_status(self, obj):
         """Determine overall warranty status"""
-        from django.utils import timezone
         today = timezone.now().date()
         
         # Check all items with warranty expiry
@@ -190,7 +192,6 @@ class CustomerReceiptListSerializer(serializers.ModelSerializer):
     
     def get_days_left(self, obj):
         """Get minimum days left from all items"""
-        from django.utils import timezone
         today = timezone.now().date()
         
         items_with_warranty = obj.items.filter(warranty_expiry__isnull=False, warranty_expiry__gte=today)
@@ -253,8 +254,6 @@ class CustomerReceiptDetailSerializer(serializers.ModelSerializer):
     
     def get_warranties(self, obj):
         """Get all warranties for items in this receipt"""
-        from warranties.models import Warranty
-        
         # Get all warranties for items in this receipt
         warranties = Warranty.objects.filter(
             receipt_item__receipt=obj
@@ -274,8 +273,6 @@ class CustomerReceiptDetailSerializer(serializers.ModelSerializer):
     
     def get_can_claim(self, obj):
         """Check if customer can start a claim"""
-        from warranties.models import Warranty
-        
         # Can claim if there's at least one active warranty
         active_warranties = Warranty.objects.filter(
             receipt_item__receipt=obj,
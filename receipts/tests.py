@@ -1,3 +1,164 @@
-from django.test import TestCase
+import csv
+from datetime import date
 
-# Create your tests here.
+from django.contrib import admin
+from django.contrib.auth import get_user_model
+from django.test import SimpleTestCase, TestCase, RequestFactory
+from rest_framework.test import APIClient
+from store.models import Store
+from warranties.models import Warranty
+from .admin import HasWarrantyFilter
+from .models import Receipt, ReceiptItem
+from .utils import csv_response
+
+User = get_user_model()
+
+
+def create_user(email, role):
+    return User.objects.create_user(email, email.split('@')[0].title(), 'pass', role=role)
+
+
+def create_store(name='Store'):
+    return Store.objects.create(name=name, phone_number='1', email='store@example.com', address='Street 1')
+
+
+def create_receipt(store, retailer, customer, receipt_date=date(2026, 1, 10)):
+    return Receipt.objects.create(store=store, retailer=retailer, customer=customer, total=100, date=receipt_date)
+
+
+class CsvResponseTests(SimpleTestCase):
+    """Gzip negotiation of the streamed CSV exports"""
+
+    def export(self, accept_encoding=None):
+        headers = {} if accept_encoding is None else {'HTTP_ACCEPT_ENCODING': accept_encoding}
+        request = RequestFactory().get('/export/', **headers)
+        return csv_response(request, [['id'], [1]], 'export.csv')
+
+    def test_gzip_when_accepted(self):
+        response = self.export('deflate, gzip')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+
+    def test_gzip_with_zero_qvalue_is_refused(self):
+        response = self.export('gzip;q=0, identity')
+        self.assertFalse(response.has_header('Content-Encoding'))
+        self.assertEqual(b''.join(response.streaming_content), b'id\r\n1\r\n')
+
+    def test_plain_without_accept_encoding(self):
+        response = self.export()
+        self.assertFalse(response.has_header('Content-Encoding'))
+
+    def test_varies_on_accept_encoding(self):
+        for accept_encoding in ('gzip', None):
+            response = self.export(accept_encoding)
+            self.assertIn('Accept-Encoding', response['Vary'])
+
+
+class HasWarrantyFilterTests(TestCase):
+    """The admin warranty filter works on any ReceiptItem queryset"""
+
+    @classmethod
+    def setUpTestData(cls):
+        receipt = create_receipt(
+            create_store(), create_user('retailer@example.com', 'retailer'), create_user('customer@example.com', 'customer')
+        )
+        cls.covered = ReceiptItem.objects.create(receipt=receipt, product_name='Phone', price=100)
+        cls.uncovered = ReceiptItem.objects.create(receipt=receipt, product_name='Case', price=100)
+        Warranty.objects.create(
+            receipt_item=cls.covered, coverage_period_months=12, provider='Maker',
+            coverage_terms='Hardware', purchase_date=date(2026, 1, 10), expiry_date=date(2027, 1, 10)
+        )
+
+    def filtered(self, value):
+        request = RequestFactory().get('/', {'has_warranty': value})
+        params = {'has_warranty': [value]}
+        list_filter = HasWarrantyFilter(request, params, ReceiptItem, admin.site._registry[ReceiptItem])
+        # A plain queryset, without the ReceiptItemAdmin annotation
+        return list(list_filter.queryset(request, ReceiptItem.objects.all()))
+
+    def test_yes(self):
+        self.assertEqual(self.filtered('yes'), [self.covered])
+
+    def test_no(self):
+        self.assertEqual(self.filtered('no'), [self.uncovered])
+
+
+class ReceiptSearchTests(TestCase):
+    """Receipt list search"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.store = create_store()
+        cls.retailer = create_user('retailer@example.com', 'retailer')
+        cls.customer = create_user('customer@example.com', 'customer')
+        cls.receipt = create_receipt(cls.store, cls.retailer, cls.customer)
+        ReceiptItem.objects.create(receipt=cls.receipt, product_name='Laptop', price=100)
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.retailer)
+
+    def search(self, term):
+        response = self.client.get('/api/receipts/', {'search': term})
+        self.assertEqual(response.status_code, 200)
+        return [receipt['id'] for receipt in response.data['results']]
+
+    def test_short_terms_are_ignored(self):
+        other = create_receipt(self.store, self.retailer, self.customer)
+        self.assertCountEqual(self.search('zz'), [self.receipt.id, other.id])
+
+    def test_repeated_search_sees_new_receipts(self):
+        self.assertEqual(self.search('laptop'), [self.receipt.id])
+        new_receipt = create_receipt(self.store, self.retailer, self.customer)
+        ReceiptItem.objects.create(receipt=new_receipt, product_name='Laptop bag', price=10)
+        self.assertCountEqual(self.search('laptop'), [self.receipt.id, new_receipt.id])
+
+
+class MyReceiptsPaginationTests(TestCase):
+    """A retailer's own receipts are cursor-paginated, 20 per page, newest first"""
+
+    @classmethod
+    def setUpTestData(cls):
+        store = create_store()
+        cls.retailer = create_user('retailer@example.com', 'retailer')
+        customer = create_user('customer@example.com', 'customer')
+        cls.receipts = [create_receipt(store, cls.retailer, customer) for _ in range(21)]
+        create_receipt(store, create_user('other@example.com', 'retailer'), customer)
+
+    def test_cursor_pages(self):
+        client = APIClient()
+        client.force_authenticate(self.retailer)
+        first_page = client.get('/api/receipts/my_receipts/').data
+        self.assertEqual(set(first_page), {'next', 'previous', 'results'})
+        self.assertEqual(
+            [receipt['id'] for receipt in first_page['results']],
+            [receipt.id for receipt in reversed(self.receipts[1:])]
+        )
+
+        second_page = client.get(first_page['next']).data
+        self.assertEqual([receipt['id'] for receipt in second_page['results']], [self.receipts[0].id])
+        self.assertIsNone(second_page['next'])
+
+
+class ReceiptExportTests(TestCase):
+    """The receipt CSV export"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.retailer = create_user('retailer@example.com', 'retailer')
+        receipt = create_receipt(create_store(), cls.retailer, create_user('customer@example.com', 'customer'))
+        ReceiptItem.objects.create(receipt=receipt, product_name='Laptop', price=100)
+        ReceiptItem.objects.create(receipt=receipt, product_name='Mouse', price=10)
+
+    def export(self, **params):
+        client = APIClient()
+        client.force_authenticate(self.retailer)
+        response = client.get('/api/receipts/export/', params)
+        rows = list(csv.reader(b''.join(response.streaming_content).decode().splitlines()))
+        return [dict(zip(rows[0], row)) for row in rows[1:]]
+
+    def test_items_count(self):
+        self.assertEqual([row['Items Count'] for row in self.export()], ['2'])
+
+    def test_search_keeps_items_count(self):
+        # Only one item matches, but every item of the receipt is counted
+        self.assertEqual([row['Items Count'] for row in self.export(search='laptop')], ['2'])
@@ -0,0 +1,60 @@
+import csv
+import io
+import re
+from itertools import islice
+
+from django.http import StreamingHttpResponse
+from django.utils.cache import patch_vary_headers
+from django.utils.text import compress_sequence
+
+# Number of CSV rows rendered into each streamed (and compressed) chunk
+CSV_CHUNK_ROWS = 500
+
+# q-value of an Accept-Encoding entry, e.g. the 0 of "gzip;q=0"
+ACCEPT_QVALUE_RE = re.compile(r'\bq\s*=\s*(\d+(?:\.\d*)?)')
+
+
+def accepts_gzip(request):
+    """
+    Whether the request's Accept-Encoding allows gzip; an explicit q=0 refuses it
+    """
+    for coding in request.META.get('HTTP_ACCEPT_ENCODING', '').split(','):
+        name, _, params = coding.partition(';')
+        if name.strip().lower() != 'gzip':
+            continue
+        qvalue = ACCEPT_QVALUE_RE.search(params)
+        return qvalue is None or float(qvalue.group(1)) > 0
+    return False
+
+
+def iter_csv(rows):
+    """
+    Render rows as CSV and yield them as encoded chunks of CSV_CHUNK_ROWS rows
+    Each chunk is written with a single writerows() call so the per-row
+    formatting loop runs inside the C csv module
+    """
+    rows = iter(rows)
+    while True:
+        chunk = list(islice(rows, CSV_CHUNK_ROWS))
+        if not chunk:
+            break
+        buffer = io.StringIO()
+        csv.writer(buffer).writerows(chunk)
+        yield buffer.getvalue().encode('utf-8')
+
+
+def csv_response(request, rows, filename):
+    """
+    Stream rows as a CSV attachment, gzip-encoded when the client accepts it
+    """
+    content = iter_csv(rows)
+    use_gzip = accepts_gzip(request)
+    if use_gzip:
+        content = compress_sequence(content)
+    
+    response = StreamingHttpResponse(content, content_type='text/csv')
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    if use_gzip:
+        response['Content-Encoding'] = 'gzip'
+    patch_vary_headers(response, ('Accept-Encoding',))
+    return response
@@ -1,17 +1,24 @@
 from rest_framework import viewsets, permissions, status, generics
 from rest_framework.decorators import action
+from rest_framework.pagination import CursorPagination
 from rest_framework.response import Response
 from .models import Receipt, ReceiptItem
+from warranties.models import Warranty
 from .serializers import (
     ReceiptSerializer, ReceiptCreateSerializer, ReceiptItemWithReceiptSerializer,
     CustomerReceiptListSerializer, CustomerReceiptDetailSerializer
 )
-from django.db.models import Q, Sum, Count
+from django.db.models import Q, Sum, Count, OuterRef, Subquery, Exists
+from django.db.models.functions import Coalesce
 from django.utils import timezone
 from datetime import datetime, timedelta
-import csv
-from django.http import HttpResponse
 from notifications.utils import notify_new_receipt
+from store.serializers import admins_prefetch
+from .utils import csv_response
+
+# Shorter search terms match most receipts, so they are ignored
+SEARCH_MIN_LENGTH = 3
+
 
 class IsRetailerOrAdmin(permissions.BasePermission):
     """
@@ -25,7 +32,15 @@ class IsRetailerOrAdmin(permissions.BasePermission):
         if request.user.role == 'admin':
             return True
         # Retailers can only manage their own receipts
-        return obj.retailer == request.user
+        return obj.retailer_id == request.user.id
+
+
+class ReceiptCursorPagination(CursorPagination):
+    """
+    Cursor pagination for a retailer's own receipts, newest first
+    """
+    page_size = 20
+    ordering = '-created_at'
 
 
 class ReceiptViewSet(viewsets.ModelViewSet):
@@ -47,8 +62,9 @@ class ReceiptViewSet(viewsets.ModelViewSet):
             return Receipt.objects.none()
         
         # Apply search filter
+        # Terms shorter than SEARCH_MIN_LENGTH are ignored
         search = self.request.query_params.get('search', None)
-        if search:
+        if search and len(search) >= SEARCH_MIN_LENGTH:
             queryset = queryset.filter(
                 Q(receipt_number__icontains=search) |
                 Q(customer__username__icontains=search) |
@@ -68,7 +84,9 @@ class ReceiptViewSet(viewsets.ModelViewSet):
             elif warranty_filter == 'pending':
                 queryset = queryset.filter(items__warranty_expiry__isnull=True).distinct()
         
-        return queryset.select_related('store', 'retailer', 'customer').prefetch_related('items')
+        return queryset.select_related('store', 'retailer', 'customer').prefetch_related(
+            'items', admins_prefetch('store__admins')
+        )
     
     def get_serializer_class(self):
         if self.action == 'create':
@@ -134,12 +152,19 @@ class ReceiptViewSet(viewsets.ModelViewSet):
             'results': serializer.data
         })
     
-    @action(detail=False, methods=['get'])
+    @action(detail=False, methods=['get'], pagination_class=ReceiptCursorPagination)
     def my_receipts(self, request):
         """
         Get receipts created by the current retailer
+        Reuses the optimized list queryset; results are cursor-paginated
         """
-        receipts = Receipt.objects.filter(retailer=request.user)
+        receipts = self.filter_queryset(self.get_queryset()).filter(retailer=request.user)
+
+        page = self.paginate_queryset(receipts)
+        if page is not None:
+            serializer = self.get_serializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
+
         serializer = self.get_serializer(receipts, many=True)
         return Response(serializer.data)
     
@@ -172,34 +197,29 @@ class ReceiptViewSet(viewsets.ModelViewSet):
         """
         receipt = self.get_object()
         
-        # Create CSV response
-        response = HttpResponse(content_type='text/csv')
-        response['Content-Disposition'] = f'attachment; filename="receipt_{receipt.receipt_number}.csv"'
-        
-        writer = csv.writer(response)
-        
-        # Write receipt header info
-        writer.writerow(['RECEIPT DETAILS'])
-        writer.writerow(['Receipt Number', receipt.receipt_number])
-        writer.writerow(['Date', receipt.date])
-        writer.writerow(['Time', receipt.time or 'N/A'])
-        writer.writerow(['Store', receipt.store.name])
-        writer.writerow(['Customer', receipt.customer.email])
-        writer.writerow(['Retailer', receipt.retailer.email])
-        writer.writerow(['Payment Method', receipt.payment_method or 'N/A'])
-        writer.writerow([])
-        
-        # Write items header
-        writer.writerow(['ITEMS'])
-        writer.writerow([
-            'Product Name', 'Model', 'Serial Number', 
-            'Price', 'Quantity', 'Item Total', 
-            'Warranty Coverage', 'Warranty Expiry'
-        ])
-        
-        # Write items
+        # Receipt header info
+        rows = [
+            ['RECEIPT DETAILS'],
+            ['Receipt Number', receipt.receipt_number],
+            ['Date', receipt.date],
+            ['Time', receipt.time or 'N/A'],
+            ['Store', receipt.store.name],
+            ['Customer', receipt.customer.email],
+            ['Retailer', receipt.retailer.email],
+            ['Payment Method', receipt.payment_method or 'N/A'],
+            [],
+            # Items header
+            ['ITEMS'],
+            [
+                'Product Name', 'Model', 'Serial Number', 
+                'Price', 'Quantity', 'Item Total', 
+                'Warranty Coverage', 'Warranty Expiry'
+            ],
+        ]
+        
+        # Items
         for item in receipt.items.all():
-            writer.writerow([
+            rows.append([
                 item.product_name,
                 item.model or '',
                 item.serial_number or '',
@@ -210,49 +230,53 @@ class ReceiptViewSet(viewsets.ModelViewSet):
                 item.warranty_expiry or ''
             ])
         
-        # Write total
-        writer.writerow([])
-        writer.writerow(['TOTAL', '', '', '', '', receipt.total])
+        # Total
+        rows.append([])
+        rows.append(['TOTAL', '', '', '', '', receipt.total])
         
         if receipt.notes:
-            writer.writerow([])
-            writer.writerow(['NOTES'])
-            writer.writerow([receipt.notes])
+            rows.append([])
+            rows.append(['NOTES'])
+            rows.append([receipt.notes])
         
-        return response
+        return csv_response(request, rows, f'receipt_{receipt.receipt_number}.csv')
     
     @action(detail=False, methods=['get'])
     def export(self, request):
         """
         Export all receipts to CSV (summary only, no items)
+        Rows are streamed so large exports are never buffered in memory
         """
-        queryset = self.get_queryset()
-        
-        # Create CSV response
-        response = HttpResponse(content_type='text/csv')
-        response['Content-Disposition'] = f'attachment; filename="receipts_{timezone.now().strftime("%Y%m%d_%H%M%S")}.csv"'
-        
-        writer = csv.writer(response)
-        writer.writerow([
-            'Receipt Number', 'Store', 'Customer', 'Retailer', 
-            'Total', 'Items Count', 'Date', 'Time', 'Payment Method', 'Notes'
-        ])
-        
-        for receipt in queryset:
-            writer.writerow([
-                receipt.receipt_number,
-                receipt.store.name,
-                receipt.customer.email,
-                receipt.retailer.email,
-                receipt.total,
-                receipt.items.count(),
-                receipt.date,
-                receipt.time or '',
-                receipt.payment_method or '',
-                receipt.notes or ''
-            ])
+        # Count items in a correlated subquery instead of one COUNT per receipt.
+        # A plain Count('items') would be narrowed by the items join of the search filter.
+        items_count = ReceiptItem.objects.filter(
+            receipt=OuterRef('pk')
+        ).order_by().values('receipt').annotate(count=Count('id')).values('count')
+        queryset = self.get_queryset().prefetch_related(None).annotate(
+            items_count=Coalesce(Subquery(items_count), 0)
+        )
         
-        return response
+        def rows():
+            yield [
+                'Receipt Number', 'Store', 'Customer', 'Retailer', 
+                'Total', 'Items Count', 'Date', 'Time', 'Payment Method', 'Notes'
+            ]
+            for receipt in queryset.iterator(chunk_size=2000):
+                yield [
+                    receipt.receipt_number,
+                    receipt.store.name,
+                    receipt.customer.email,
+                    receipt.retailer.email,
+                    receipt.total,
+                    receipt.items_count,
+                    receipt.date,
+                    receipt.time or '',
+                    receipt.payment_method or '',
+                    receipt.notes or ''
+                ]
+        
+        filename = f'receipts_{timezone.now().strftime("%Y%m%d_%H%M%S")}.csv'
+        return csv_response(request, rows(), filename)
 
 
 class ReceiptItemsWithoutWarrantyView(generics.ListAPIView):
@@ -269,8 +293,11 @@ class ReceiptItemsWithoutWarrantyView(generics.ListAPIView):
         """
         user = self.request.user
         
-        # Base queryset: items without warranties
-        queryset = ReceiptItem.objects.filter(warranty__isnull=True).select_related(
+        # Base queryset: items without warranties (probes the unique receipt_item_id
+        # index; the annotation also answers has_warranty without a query per item)
+        queryset = ReceiptItem.objects.annotate(
+            has_warranty_annotated=Exists(Warranty.objects.filter(receipt_item=OuterRef('pk')))
+        ).filter(has_warranty_annotated=False).select_related(
             'receipt', 'receipt__store', 'receipt__customer', 'receipt__retailer'
         )
         
@@ -496,19 +523,21 @@ class CustomerHomeView(generics.GenericAPIView):
             receipt__customer=user,
             warranty_expiry__gte=today,
             warranty_expiry__lte=expiring_soon_date
-        ).select_related('receipt__store').order_by('warranty_expiry')[:5]
+        ).order_by('warranty_expiry').values(
+            'id', 'product_name', 'warranty_expiry', 'price', 'receipt_id', 'receipt__store__name'
+        )[:5]
         
         expiring_soon_list = []
         for item in expiring_soon_items:
-            days_left = (item.warranty_expiry - today).days
+            days_left = (item['warranty_expiry'] - today).days
             expiring_soon_list.append({
-                'id': item.id,
-                'product_name': item.product_name,
-                'store_name': item.receipt.store.name,
+                'id': item['id'],
+                'product_name': item['product_name'],
+                'store_name': item['receipt__store__name'],
                 'days_left': days_left,
-                'warranty_expiry': item.warranty_expiry,
-                'receipt_id': item.receipt.id,
-                'price': str(item.price)
+                'warranty_expiry': item['warranty_expiry'],
+                'receipt_id': item['receipt_id'],
+                'price': str(item['price'])
             })
         
         # Get recent purchases (last 10 receipts)
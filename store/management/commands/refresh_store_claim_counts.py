@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+from store.models import Store
+from store.utils import claim_count_subqueries, invalidate_public_store_pages
+
+
+class Command(BaseCommand):
+    help = (
+        'Recounts the denormalized approved, rejected and pending claim counts of every store. '
+        'Run it after bulk updates, raw SQL or loaddata, which bypass the store signals'
+    )
+
+    def handle(self, *args, **options):
+        updated = Store.objects.update(**claim_count_subqueries())
+        invalidate_public_store_pages()
+        self.stdout.write(self.style.SUCCESS(f'Claim counts refreshed for {updated} stores'))
@@ -0,0 +1,55 @@
+# Generated by Django 5.2.7 on 2026-10-16 04:43
+
+from django.db import migrations, models
+from django.db.models import Count, Q, OuterRef, Subquery, IntegerField
+from django.db.models.functions import Coalesce
+
+
+def backfill_claim_counts(apps, schema_editor):
+    """Fill the new claim count columns from the existing claims"""
+    Store = apps.get_model('store', 'Store')
+    Claim = apps.get_model('claims', 'Claim')
+    
+    claim_stats = Claim.objects.filter(
+        warranty__receipt_item__receipt__store=OuterRef('pk')
+    ).order_by().values('warranty__receipt_item__receipt__store').annotate(
+        approved=Count('id', filter=Q(status='Approved')),
+        rejected=Count('id', filter=Q(status='Rejected')),
+        pending=Count('id', filter=Q(status='In Review')),
+    )
+    
+    def bucket(name):
+        return Coalesce(Subquery(claim_stats.values(name)[:1], output_field=IntegerField()), 0)
+    
+    Store.objects.update(
+        approved_claims_count=bucket('approved'),
+        rejected_claims_count=bucket('rejected'),
+        pending_claims_count=bucket('pending'),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('store', '0004_store_search_trgm_indexes'),
+        ('claims', '0009_claim_dashboard_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='store',
+            name='approved_claims_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='store',
+            name='pending_claims_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='store',
+            name='rejected_claims_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_claim_counts, migrations.RunPython.noop),
+    ]
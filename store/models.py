@@ -1,5 +1,7 @@
 from django.db import models
 from django.contrib.auth import get_user_model
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.db.models.functions import Upper
 
 User = get_user_model()
 
@@ -28,6 +30,11 @@ class Store(models.Model):
         help_text="Indicates if the store is verified by admin"
     )
     admins = models.ManyToManyField(User, related_name='managed_stores', limit_choices_to={'role': 'retailer'})
+    # Denormalized claim counts for the public store APIs, kept current by store.signals.
+    # Bulk updates, raw SQL and loaddata bypass the signals; run refresh_store_claim_counts after them
+    approved_claims_count = models.PositiveIntegerField(default=0, editable=False)
+    rejected_claims_count = models.PositiveIntegerField(default=0, editable=False)
+    pending_claims_count = models.PositiveIntegerField(default=0, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
@@ -37,3 +44,11 @@ class Store(models.Model):
     
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            # Trigram indexes for admin/public icontains search, which Postgres
+            # runs as UPPER(column) LIKE UPPER(...), so the UPPER() expression is indexed
+            GinIndex(OpClass(Upper('name'), name='gin_trgm_ops'), name='store_name_trgm_upper'),
+            GinIndex(OpClass(Upper('email'), name='gin_trgm_ops'), name='store_email_trgm_upper'),
+            GinIndex(OpClass(Upper('phone_number'), name='gin_trgm_ops'), name='store_phone_trgm_upper'),
+            GinIndex(OpClass(Upper('address'), name='gin_trgm_ops'), name='store_address_trgm_upper'),
+        ]
@@ -1,13 +1,117 @@
 from rest_framework import serializers
+from rest_framework.relations import MANY_RELATION_KWARGS
 from .models import Store
+from .utils import time_ago
 from accounts.serializers import UserSerializer
 from django.contrib.auth import get_user_model
+from django.db.models import Prefetch
+from django.utils.functional import cached_property
 
 User = get_user_model()
 
+# Store image upload limits
+MAX_IMAGE_SIZE = 10 * 1024 * 1024  # 10MB in bytes
+ALLOWED_IMAGE_TYPES = frozenset({
+    'image/jpeg', 'image/jpg', 'image/png', 'image/gif', 'image/webp', 'image/svg+xml'
+})
+
+# Map URL templates, filled with store coordinates
+YANDEX_ROUTE_URL = "https://yandex.com/maps/?rtext=~{lat},{lng}&rtt=auto"
+GOOGLE_ROUTE_URL = "https://www.google.com/maps/dir/?api=1&destination={lat},{lng}"
+YANDEX_EMBED_URL = "https://yandex.com/map-widget/v1/?ll={lng},{lat}&z=16&pt={lng},{lat},pm2rdm"
+GOOGLE_EMBED_URL = "https://www.google.com/maps/embed/v1/place?key=YOUR_API_KEY&q={lat},{lng}&zoom=16"
+
+
+def admins_prefetch(lookup='admins'):
+    """
+    Prefetch for StoreSerializer.admins that loads only the UserSerializer columns
+    """
+    return Prefetch(lookup, queryset=User.objects.only(*UserSerializer.Meta.fields))
+
+
+class UserSummaryField(serializers.RelatedField):
+    """
+    Read-only user representation with the UserSerializer fields, read straight
+    from the instance instead of running a nested serializer per user
+    """
+    fields = UserSerializer.Meta.fields
+    
+    def to_representation(self, value):
+        return {name: getattr(value, name) for name in self.fields}
+
+
+class BulkManyRelatedField(serializers.ManyRelatedField):
+    """
+    Resolves a list of primary keys with one pk__in query instead of one query per pk
+    """
+    def to_internal_value(self, data):
+        if isinstance(data, str) or not hasattr(data, '__iter__'):
+            self.fail('not_a_list', input_type=type(data).__name__)
+        if not self.allow_empty and len(data) == 0:
+            self.fail('empty')
+        
+        child = self.child_relation
+        pks = []
+        for pk in data:
+            if isinstance(pk, bool):
+                child.fail('incorrect_type', data_type=type(pk).__name__)
+            try:
+                pks.append(int(pk))
+            except (TypeError, ValueError):
+                child.fail('incorrect_type', data_type=type(pk).__name__)
+        
+        objects = child.get_queryset().in_bulk(pks)
+        for pk in pks:
+            if pk not in objects:
+                child.fail('does_not_exist', pk_value=pk)
+        return [objects[pk] for pk in pks]
+
+
+class BulkPrimaryKeyRelatedField(serializers.PrimaryKeyRelatedField):
+    """
+    PrimaryKeyRelatedField whose many=True form validates all pks in a single query
+    """
+    @classmethod
+    def many_init(cls, *args, **kwargs):
+        list_kwargs = {'child_relation': cls(*args, **kwargs)}
+        for key in kwargs:
+            if key in MANY_RELATION_KWARGS:
+                list_kwargs[key] = kwargs[key]
+        return BulkManyRelatedField(**list_kwargs)
+
+
+class StoreImageUrlField(serializers.ReadOnlyField):
+    """
+    Absolute URL of a store image, built from the serializer's cached request host prefix
+    """
+    def to_representation(self, image):
+        if not image:
+            return None
+        url = image.url
+        # Storage backends may already return absolute URLs
+        if url.startswith('/'):
+            url = self.parent._absolute_url_prefix + url
+        return url
+
+
+class StoreMapUrlField(serializers.ReadOnlyField):
+    """
+    Map URL of the store, filled from one of the map URL templates with its coordinates
+    """
+    def __init__(self, template, **kwargs):
+        kwargs['source'] = '*'
+        super().__init__(**kwargs)
+        self.template = template
+    
+    def to_representation(self, store):
+        if store.latitude and store.longitude:
+            return self.template.format(lat=store.latitude, lng=store.longitude)
+        return None
+
+
 class StoreSerializer(serializers.ModelSerializer):
-    admins = UserSerializer(many=True, read_only=True)
-    admin_ids = serializers.PrimaryKeyRelatedField(
+    admins = UserSummaryField(many=True, read_only=True)
+    admin_ids = BulkPrimaryKeyRelatedField(
         many=True, 
         write_only=True, 
         queryset=User.objects.filter(role='retailer'),
@@ -29,15 +133,13 @@ class StoreSerializer(serializers.ModelSerializer):
             return value
         
         # Check file size (max 10MB)
-        max_size = 10 * 1024 * 1024  # 10MB in bytes
-        if value.size > max_size:
+        if value.size > MAX_IMAGE_SIZE:
             raise serializers.ValidationError(
                 f"File size exceeds maximum limit of 10MB. Your file is {value.size / (1024*1024):.2f}MB"
             )
         
         # Check file type (images only)
-        allowed_types = ['image/jpeg', 'image/jpg', 'image/png', 'image/gif', 'image/webp', 'image/svg+xml']
-        if value.content_type not in allowed_types:
+        if value.content_type not in ALLOWED_IMAGE_TYPES:
             raise serializers.ValidationError(
                 f"Invalid file type. Allowed types: JPEG, PNG, GIF, WebP, SVG. Got: {value.content_type}"
             )
@@ -49,9 +151,9 @@ class StoreListSerializer(serializers.ModelSerializer):
     """
     Public serializer for store list with map URLs and success rate
     """
-    image_url = serializers.SerializerMethodField()
-    yandex_map_url = serializers.SerializerMethodField()
-    google_map_url = serializers.SerializerMethodField()
+    image_url = StoreImageUrlField(source='image')
+    yandex_map_url = StoreMapUrlField(YANDEX_ROUTE_URL)
+    google_map_url = StoreMapUrlField(GOOGLE_ROUTE_URL)
     success_rate = serializers.SerializerMethodField()
     total_claims = serializers.SerializerMethodField()
     approved_claims = serializers.SerializerMethodField()
@@ -67,28 +169,13 @@ class StoreListSerializer(serializers.ModelSerializer):
             'created_at'
         ]
     
-    def get_image_url(self, obj):
-        """Get full URL for store image"""
-        if obj.image:
-            request = self.context.get('request')
-            if request:
-                return request.build_absolute_uri(obj.image.url)
-            return obj.image.url
-        return None
-    
-    def get_yandex_map_url(self, obj):
-        """Generate Yandex Maps route URL"""
-        if obj.latitude and obj.longitude:
-            # Yandex Maps route URL format
-            return f"https://yandex.com/maps/?rtext=~{obj.latitude},{obj.longitude}&rtt=auto"
-        return None
-    
-    def get_google_map_url(self, obj):
-        """Generate Google Maps route URL"""
-        if obj.latitude and obj.longitude:
-            # Google Maps route URL format
-            return f"https://www.google.com/maps/dir/?api=1&destination={obj.latitude},{obj.longitude}"
-        return None
+    @cached_property
+    def _absolute_url_prefix(self):
+        """Scheme and host of the current request, built once per serializer"""
+        request = self.context.get('request')
+        if request:
+            return request.build_absolute_uri('/')[:-1]
+        return ''
     
     def get_total_claims(self, obj):
         """Get total number of claims for this store (from annotation)"""
@@ -107,36 +194,22 @@ class StoreListSerializer(serializers.ModelSerializer):
     
     def get_success_rate(self, obj):
         """
-        Calculate success rate (approval rate) for the store
-        Uses annotated field if available for better performance
+        Success rate (approval rate) for the store, already rounded by the annotation
         """
-        # Use pre-calculated success rate from annotation
-        success_rate = getattr(obj, 'calculated_success_rate', None)
-        
-        if success_rate is not None:
-            return round(success_rate, 1)
-        
-        return None
+        return getattr(obj, 'calculated_success_rate', None)
 
 
-class StoreDetailSerializer(serializers.ModelSerializer):
+class StoreDetailSerializer(StoreListSerializer):
     """
     Public serializer for store detail with map URLs, admin info, and success rate
+    Shares the URL handling and claim statistics getters of StoreListSerializer
     """
-    image_url = serializers.SerializerMethodField()
-    yandex_map_url = serializers.SerializerMethodField()
-    google_map_url = serializers.SerializerMethodField()
-    yandex_map_embed_url = serializers.SerializerMethodField()
-    google_map_embed_url = serializers.SerializerMethodField()
+    yandex_map_embed_url = StoreMapUrlField(YANDEX_EMBED_URL)
+    google_map_embed_url = StoreMapUrlField(GOOGLE_EMBED_URL)
     admin_count = serializers.SerializerMethodField()
-    success_rate = serializers.SerializerMethodField()
-    total_claims = serializers.SerializerMethodField()
-    approved_claims = serializers.SerializerMethodField()
-    rejected_claims = serializers.SerializerMethodField()
     pending_claims = serializers.SerializerMethodField()
     
-    class Meta:
-        model = Store
+    class Meta(StoreListSerializer.Meta):
         fields = [
             'id', 'name', 'image', 'image_url', 'phone_number', 'email', 
             'address', 'latitude', 'longitude', 'is_verified',
@@ -147,70 +220,28 @@ class StoreDetailSerializer(serializers.ModelSerializer):
             'created_at', 'updated_at'
         ]
     
-    def get_image_url(self, obj):
-        """Get full URL for store image"""
-        if obj.image:
-            request = self.context.get('request')
-            if request:
-                return request.build_absolute_uri(obj.image.url)
-            return obj.image.url
-        return None
-    
-    def get_yandex_map_url(self, obj):
-        """Generate Yandex Maps route URL"""
-        if obj.latitude and obj.longitude:
-            return f"https://yandex.com/maps/?rtext=~{obj.latitude},{obj.longitude}&rtt=auto"
-        return None
-    
-    def get_google_map_url(self, obj):
-        """Generate Google Maps route URL"""
-        if obj.latitude and obj.longitude:
-            return f"https://www.google.com/maps/dir/?api=1&destination={obj.latitude},{obj.longitude}"
-        return None
-    
-    def get_yandex_map_embed_url(self, obj):
-        """Generate Yandex Maps embed URL for iframe"""
-        if obj.latitude and obj.longitude:
-            return f"https://yandex.com/map-widget/v1/?ll={obj.longitude},{obj.latitude}&z=16&pt={obj.longitude},{obj.latitude},pm2rdm"
-        return None
-    
-    def get_google_map_embed_url(self, obj):
-        """Generate Google Maps embed URL for iframe"""
-        if obj.latitude and obj.longitude:
-            return f"https://www.google.com/maps/embed/v1/place?key=YOUR_API_KEY&q={obj.latitude},{obj.longitude}&zoom=16"
-        return None
-    
     def get_admin_count(self, obj):
         """Get number of store admins (from annotation)"""
-        # Use annotated field if available, otherwise count
-        return getattr(obj, 'admin_count_annotated', obj.admins.count() if hasattr(obj, 'admins') else 0)
-    
-    def get_total_claims(self, obj):
-        """Get total number of claims for this store (from annotation)"""
-        return getattr(obj, 'total_claims_count', 0)
-    
-    def get_approved_claims(self, obj):
-        """Get number of approved claims (from annotation)"""
-        return getattr(obj, 'approved_claims_count', 0)
-    
-    def get_rejected_claims(self, obj):
-        """Get number of rejected claims (from annotation)"""
-        return getattr(obj, 'rejected_claims_count', 0)
+        return getattr(obj, 'admin_count_annotated', 0)
     
     def get_pending_claims(self, obj):
         """Get number of pending (In Review) claims (from annotation)"""
         return getattr(obj, 'pending_claims_count', 0)
-    
-    def get_success_rate(self, obj):
-        """
-        Calculate success rate (approval rate) for the store
-        Uses annotated field if available for better performance
-        """
-        # Use pre-calculated success rate from annotation
-        success_rate = getattr(obj, 'calculated_success_rate', None)
-        
-        if success_rate is not None:
-            return round(success_rate, 1)
-        
-        return None
 
+
+class StoreActivitySerializer(serializers.Serializer):
+    """
+    Recent activity entry of the store dashboard, built from the activity dicts of
+    StoreViewSet._get_recent_activity; time_ago is relative to context['now']
+    """
+    type = serializers.CharField()
+    title = serializers.CharField()
+    description = serializers.CharField()
+    status = serializers.CharField(allow_null=True)
+    icon = serializers.CharField()
+    performed_by = serializers.CharField()
+    time_ago = serializers.SerializerMethodField()
+    
+    def get_time_ago(self, obj):
+        """Human-readable age of the activity"""
+        return time_ago((self.context['now'] - obj['timestamp']).total_seconds())
@@ -0,0 +1,98 @@
+from django.db.models.signals import pre_save, post_save, post_delete, m2m_changed
+from django.dispatch import receiver
+from receipts.models import Receipt, ReceiptItem
+from warranties.models import Warranty
+from claims.models import Claim
+from .models import Store
+from .utils import invalidate_store_statistics, invalidate_public_store_pages, refresh_store_claim_counts
+
+
+@receiver([post_save, post_delete], sender=Store)
+def store_changed(sender, instance, **kwargs):
+    """Store details are rendered by the cached public store responses"""
+    invalidate_public_store_pages()
+
+
+@receiver(m2m_changed, sender=Store.admins.through)
+def store_admins_changed(sender, action, **kwargs):
+    """The public store detail shows the admin count"""
+    if action in ('post_add', 'post_remove', 'post_clear'):
+        invalidate_public_store_pages()
+
+
+def store_moved(previous_store_id, store_id):
+    """
+    Warranties and their claims moved from one store to another; recount the claims of
+    both. warranties.signals has already copied the new store onto the warranties, as its
+    receivers are connected first (warranties comes before store in INSTALLED_APPS).
+    """
+    if previous_store_id is not None and previous_store_id != store_id:
+        refresh_store_claim_counts(previous_store_id, store_id)
+        invalidate_public_store_pages()
+
+
+@receiver(pre_save, sender=Receipt)
+def remember_receipt_store(sender, instance, **kwargs):
+    """Keep the saved store of a receipt, so moving it updates the old store too"""
+    instance._previous_store_id = None if instance._state.adding else (
+        Receipt.objects.filter(pk=instance.pk).values_list('store_id', flat=True).first()
+    )
+
+
+@receiver(pre_save, sender=ReceiptItem)
+def remember_receipt_item_store(sender, instance, **kwargs):
+    """Keep the saved store of a receipt item, so moving it to another receipt updates the old store too"""
+    instance._previous_store_id = None if instance._state.adding else (
+        ReceiptItem.objects.filter(pk=instance.pk).values_list('receipt__store_id', flat=True).first()
+    )
+
+
+@receiver([post_save, post_delete], sender=Receipt)
+def receipt_changed(sender, instance, **kwargs):
+    """Receipts feed the receipt counts and recent activity of their store"""
+    previous_store_id = getattr(instance, '_previous_store_id', None)
+    store_moved(previous_store_id, instance.store_id)
+    invalidate_store_statistics(previous_store_id, instance.store_id)
+
+
+@receiver(post_save, sender=ReceiptItem)
+def receipt_item_changed(sender, instance, created, **kwargs):
+    """A receipt item moved to a receipt of another store takes its warranty along"""
+    previous_store_id = getattr(instance, '_previous_store_id', None)
+    if created or previous_store_id is None:
+        return
+    store_id = Receipt.objects.filter(pk=instance.receipt_id).values_list('store_id', flat=True).first()
+    if previous_store_id != store_id:
+        store_moved(previous_store_id, store_id)
+        invalidate_store_statistics(previous_store_id, store_id)
+
+
+@receiver([post_save, post_delete], sender=Warranty)
+def warranty_changed(sender, instance, **kwargs):
+    """Warranties feed the active warranty counts and recent activity of their store"""
+    if kwargs['signal'] is post_delete:
+        # Claims deleted with the warranty may not have found it to recount their store
+        refresh_store_claim_counts(instance.store_id)
+        invalidate_public_store_pages()
+    invalidate_store_statistics(instance.store_id)
+
+
+@receiver(pre_save, sender=Claim)
+def remember_claim_store(sender, instance, **kwargs):
+    """Keep the saved store of a claim, so moving it to another warranty updates the old store too"""
+    instance._previous_store_id = None if instance._state.adding else (
+        Claim.objects.filter(pk=instance.pk).values_list('warranty__store_id', flat=True).first()
+    )
+
+
+@receiver([post_save, post_delete], sender=Claim)
+def claim_changed(sender, instance, **kwargs):
+    """Claims feed the claim counts, resolution time and recent activity of their store"""
+    # Only the store id is read; the warranty may already be gone in a cascade delete
+    store_id = Warranty.objects.filter(pk=instance.warranty_id).values_list('store_id', flat=True).first()
+    store_ids = {store_id, getattr(instance, '_previous_store_id', None)} - {None}
+    if not store_ids:
+        return
+    refresh_store_claim_counts(*store_ids)
+    invalidate_store_statistics(*store_ids)
+    invalidate_public_store_pages()
@@ -1,3 +1,287 @@
-from django.test import TestCase
+from datetime import date
+from decimal import Decimal
+from importlib import import_module
+from io import StringIO
 
-# Create your tests here.
+from django.apps import apps
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase, RequestFactory, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+from claims.models import Claim
+from receipts.models import Receipt, ReceiptItem
+from warranties.models import Warranty
+from .models import Store
+from .serializers import StoreListSerializer, StoreDetailSerializer
+
+User = get_user_model()
+
+# Cached responses and statistics are tested against a per-process cache
+LOCMEM_CACHES = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+
+
+def create_user(email, role):
+    return User.objects.create_user(email, email.split('@')[0].title(), 'pass', role=role)
+
+
+def create_store(name='Store'):
+    return Store.objects.create(name=name, phone_number='1', email='store@example.com', address='Street 1')
+
+
+def create_receipt(store, retailer, customer, receipt_date=date(2026, 1, 10)):
+    return Receipt.objects.create(store=store, retailer=retailer, customer=customer, total=100, date=receipt_date)
+
+
+def create_warranty(store, retailer, customer, product_name='Phone'):
+    receipt = create_receipt(store, retailer, customer)
+    item = ReceiptItem.objects.create(receipt=receipt, product_name=product_name, price=100)
+    return Warranty.objects.create(
+        receipt_item=item, coverage_period_months=12, provider='Maker', coverage_terms='Hardware',
+        purchase_date=date(2026, 1, 10), expiry_date=date(2027, 1, 10)
+    )
+
+
+def create_claim(warranty, status='In Review'):
+    return Claim.objects.create(
+        warranty=warranty, issue_summary='Broken', detailed_description='Screen broke', status=status
+    )
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class PublicStoreCacheTests(TestCase):
+    """Cached public store responses are dropped when the data behind them changes"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.retailer = create_user('retailer@example.com', 'retailer')
+        cls.customer = create_user('customer@example.com', 'customer')
+
+    def setUp(self):
+        cache.clear()
+        self.store = create_store()
+        self.client = APIClient()
+
+    # Responses served by cache_page are plain HttpResponses, so they are read with json()
+    def list_stores(self):
+        return self.client.get('/api/stores/list/').json()['results']
+
+    def store_detail(self):
+        return self.client.get(f'/api/stores/detail/{self.store.pk}/').json()
+
+    def test_store_change_drops_cached_list(self):
+        self.assertEqual(self.list_stores()[0]['name'], 'Store')
+        with self.captureOnCommitCallbacks(execute=True):
+            self.store.name = 'Renamed'
+            self.store.save()
+        self.assertEqual(self.list_stores()[0]['name'], 'Renamed')
+
+    def test_claim_change_drops_cached_detail(self):
+        warranty = create_warranty(self.store, self.retailer, self.customer)
+        with self.captureOnCommitCallbacks(execute=True):
+            claim = create_claim(warranty)
+        self.assertEqual(self.store_detail()['approved_claims'], 0)
+        with self.captureOnCommitCallbacks(execute=True):
+            claim.status = 'Approved'
+            claim.save()
+        self.assertEqual(self.store_detail()['approved_claims'], 1)
+
+    def test_receipt_move_drops_cached_list(self):
+        warranty = create_warranty(self.store, self.retailer, self.customer)
+        with self.captureOnCommitCallbacks(execute=True):
+            create_claim(warranty, status='Approved')
+        other_store = create_store('Other')
+        counts = {store['name']: store['approved_claims'] for store in self.list_stores()}
+        self.assertEqual(counts, {'Store': 1, 'Other': 0})
+        with self.captureOnCommitCallbacks(execute=True):
+            receipt = warranty.receipt_item.receipt
+            receipt.store = other_store
+            receipt.save()
+        counts = {store['name']: store['approved_claims'] for store in self.list_stores()}
+        self.assertEqual(counts, {'Store': 0, 'Other': 1})
+
+    def test_unchanged_data_is_served_from_cache(self):
+        self.list_stores()
+        # update() sends no signals, so the cached page stays
+        Store.objects.filter(pk=self.store.pk).update(name='Renamed')
+        self.assertEqual(self.list_stores()[0]['name'], 'Store')
+
+
+class StoreSerializerTests(SimpleTestCase):
+    """Public store representations keep their key order and URL formats"""
+
+    def store(self, **kwargs):
+        return Store(
+            pk=1, name='Store', phone_number='1', email='store@example.com', address='Street 1',
+            latitude=Decimal('41.311081'), longitude=Decimal('69.240562'), **kwargs
+        )
+
+    def test_list_key_order(self):
+        data = StoreListSerializer(self.store()).data
+        self.assertEqual(list(data), [
+            'id', 'name', 'image', 'image_url', 'phone_number', 'email',
+            'address', 'latitude', 'longitude', 'is_verified',
+            'yandex_map_url', 'google_map_url',
+            'success_rate', 'total_claims', 'approved_claims', 'rejected_claims',
+            'created_at',
+        ])
+
+    def test_detail_key_order(self):
+        data = StoreDetailSerializer(self.store()).data
+        self.assertEqual(list(data), [
+            'id', 'name', 'image', 'image_url', 'phone_number', 'email',
+            'address', 'latitude', 'longitude', 'is_verified',
+            'yandex_map_url', 'google_map_url',
+            'yandex_map_embed_url', 'google_map_embed_url',
+            'admin_count', 'success_rate', 'total_claims',
+            'approved_claims', 'rejected_claims', 'pending_claims',
+            'created_at', 'updated_at',
+        ])
+
+    def test_urls(self):
+        request = RequestFactory().get('/api/stores/list/')
+        data = StoreListSerializer(self.store(image='stores/logo.png'), context={'request': request}).data
+        self.assertEqual(data['image_url'], 'http://testserver/media/stores/logo.png')
+        self.assertEqual(data['google_map_url'], 'https://www.google.com/maps/dir/?api=1&destination=41.311081,69.240562')
+
+    def test_urls_without_image_or_coordinates(self):
+        data = StoreListSerializer(Store(pk=1, name='Store')).data
+        self.assertIsNone(data['image_url'])
+        self.assertIsNone(data['yandex_map_url'])
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class StoreClaimCountTests(TestCase):
+    """Denormalized Store claim counts follow claim changes"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.retailer = create_user('retailer@example.com', 'retailer')
+        cls.customer = create_user('customer@example.com', 'customer')
+
+    def setUp(self):
+        self.store = create_store()
+        self.warranty = create_warranty(self.store, self.retailer, self.customer)
+
+    def assertCounts(self, store, approved, rejected, pending):
+        store.refresh_from_db()
+        self.assertEqual(
+            (store.approved_claims_count, store.rejected_claims_count, store.pending_claims_count),
+            (approved, rejected, pending)
+        )
+
+    def test_create_and_status_change(self):
+        claim = create_claim(self.warranty)
+        self.assertCounts(self.store, 0, 0, 1)
+        claim.status = 'Rejected'
+        claim.save()
+        self.assertCounts(self.store, 0, 1, 0)
+
+    def test_delete(self):
+        claim = create_claim(self.warranty, status='Approved')
+        self.assertCounts(self.store, 1, 0, 0)
+        claim.delete()
+        self.assertCounts(self.store, 0, 0, 0)
+
+    def test_warranty_delete(self):
+        create_claim(self.warranty, status='Approved')
+        self.warranty.delete()
+        self.assertCounts(self.store, 0, 0, 0)
+
+    def test_move_claim_to_another_store(self):
+        claim = create_claim(self.warranty, status='Approved')
+        other_store = create_store('Other')
+        claim.warranty = create_warranty(other_store, self.retailer, self.customer, product_name='Tablet')
+        claim.save()
+        self.assertCounts(self.store, 0, 0, 0)
+        self.assertCounts(other_store, 1, 0, 0)
+
+    def test_refresh_command_repairs_bulk_updates(self):
+        claim = create_claim(self.warranty)
+        # update() sends no signals, so the counts go stale
+        Claim.objects.filter(pk=claim.pk).update(status='Approved')
+        self.assertCounts(self.store, 0, 0, 1)
+        call_command('refresh_store_claim_counts', stdout=StringIO())
+        self.assertCounts(self.store, 1, 0, 0)
+
+    def test_backfill_migration(self):
+        create_claim(self.warranty, status='Approved')
+        create_claim(self.warranty)
+        Store.objects.update(approved_claims_count=0, rejected_claims_count=0, pending_claims_count=0)
+        migration = import_module('store.migrations.0005_store_claim_counts')
+        migration.backfill_claim_counts(apps, None)
+        self.assertCounts(self.store, 1, 0, 1)
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class PublicStoreListTests(TestCase):
+    """The public store list is cursor-paginated, 50 stores per page"""
+
+    @classmethod
+    def setUpTestData(cls):
+        for number in range(51):
+            create_store(f'Store {number}')
+
+    def setUp(self):
+        cache.clear()
+
+    def test_cursor_pages(self):
+        client = APIClient()
+        first_page = client.get('/api/stores/list/').json()
+        self.assertEqual(set(first_page), {'next', 'previous', 'results'})
+        self.assertEqual(len(first_page['results']), 50)
+        self.assertIsNone(first_page['previous'])
+        # Newest first
+        self.assertEqual(first_page['results'][0]['name'], 'Store 50')
+
+        second_page = client.get(first_page['next']).json()
+        self.assertEqual([store['name'] for store in second_page['results']], ['Store 0'])
+        self.assertIsNone(second_page['next'])
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class StoreDashboardCacheTests(TestCase):
+    """Cached dashboard statistics are dropped when the store's receipts or claims change"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = create_user('admin@example.com', 'admin')
+        cls.retailer = create_user('retailer@example.com', 'retailer')
+        cls.customer = create_user('customer@example.com', 'customer')
+        cls.store = create_store()
+        cls.other_store = create_store('Other')
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def statistic(self, name, store=None):
+        store = store or self.store
+        response = self.client.get(f'/api/stores/manage/{store.pk}/dashboard/')
+        return response.data['statistics'][name]['value']
+
+    def test_new_receipt_drops_cached_statistics(self):
+        self.assertEqual(self.statistic('total_receipts'), 0)
+        with self.captureOnCommitCallbacks(execute=True):
+            create_receipt(self.store, self.retailer, self.customer, receipt_date=timezone.now().date())
+        self.assertEqual(self.statistic('total_receipts'), 1)
+
+    def test_claim_status_change_drops_cached_statistics(self):
+        warranty = create_warranty(self.store, self.retailer, self.customer)
+        with self.captureOnCommitCallbacks(execute=True):
+            claim = create_claim(warranty)
+        self.assertEqual(self.statistic('open_claims'), 1)
+        with self.captureOnCommitCallbacks(execute=True):
+            claim.status = 'Approved'
+            claim.save()
+        self.assertEqual(self.statistic('open_claims'), 0)
+
+    def test_other_store_keeps_cached_statistics(self):
+        self.assertEqual(self.statistic('total_receipts'), 0)
+        with self.captureOnCommitCallbacks(execute=True):
+            create_receipt(self.other_store, self.retailer, self.customer, receipt_date=timezone.now().date())
+        # update() sends no signals, so only a cached block can still show no receipts
+        Receipt.objects.filter(store=self.other_store).update(store=self.store)
+        self.assertEqual(self.statistic('total_receipts'), 0)
@@ -0,0 +1,109 @@
+import time
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, Q, OuterRef, Subquery, IntegerField
+from django.db.models.functions import Coalesce
+from claims.models import Claim
+from .models import Store
+
+# Dashboard statistics change slowly, so they are cached briefly per store
+STORE_STATS_CACHE_TIMEOUT = 60  # seconds
+STORE_ACTIVITY_CACHE_TIMEOUT = 30  # seconds
+
+# Bumped on every store or claim change so all cached public store responses go stale at once
+PUBLIC_STORE_CACHE_VERSION_KEY = 'public_store_version'
+
+# time_ago thresholds in seconds
+SECONDS_PER_MINUTE = 60
+SECONDS_PER_HOUR = 3600
+SECONDS_PER_DAY = 86400
+
+
+def time_ago(seconds):
+    """Human-readable age of something that happened the given seconds ago"""
+    if seconds < SECONDS_PER_MINUTE:
+        return 'Just now'
+    if seconds < SECONDS_PER_HOUR:
+        minutes = int(seconds / SECONDS_PER_MINUTE)
+        return f"{minutes} minute{'s' if minutes != 1 else ''} ago"
+    if seconds < SECONDS_PER_DAY:
+        hours = int(seconds / SECONDS_PER_HOUR)
+        return f"{hours} hour{'s' if hours != 1 else ''} ago"
+    days = int(seconds // SECONDS_PER_DAY)
+    return f"{days} day{'s' if days != 1 else ''} ago"
+
+
+def store_statistics_cache_key(store_id):
+    """Cache key of the dashboard statistics of a store"""
+    return f'store_stats:{store_id}'
+
+
+def store_activity_cache_key(store_id):
+    """Cache key of the recent activity of a store"""
+    return f'store_activity:{store_id}'
+
+
+def invalidate_store_statistics(*store_ids):
+    """
+    Drop cached dashboard statistics and recent activity of the given stores once the
+    current transaction commits, so no worker re-caches the rows from before the change
+    """
+    keys = []
+    for store_id in store_ids:
+        if store_id is not None:
+            keys.append(store_statistics_cache_key(store_id))
+            keys.append(store_activity_cache_key(store_id))
+    if keys:
+        transaction.on_commit(lambda: cache.delete_many(keys))
+
+
+def public_store_cache_prefix():
+    """cache_page key prefix of the public store list and detail responses"""
+    # A missing version is seeded with the current time, so it never reuses an old one
+    version = cache.get_or_set(PUBLIC_STORE_CACHE_VERSION_KEY, time.time_ns, None)
+    return f'public_store:{version}'
+
+
+def invalidate_public_store_pages():
+    """Make every cached public store list and detail response stale once the transaction commits"""
+    def bump_version():
+        try:
+            cache.incr(PUBLIC_STORE_CACHE_VERSION_KEY)
+        except ValueError:
+            # No version yet: the next request seeds a fresh one
+            pass
+    
+    transaction.on_commit(bump_version)
+
+
+def claim_count_subqueries():
+    """
+    Approved, rejected and pending claim counts of the outer store, keyed by the Store
+    count field names. Claims are pre-aggregated per store in a correlated subquery
+    with one conditional COUNT(...) FILTER (WHERE ...) per status bucket.
+    """
+    claim_stats = Claim.objects.filter(
+        warranty__store=OuterRef('pk')
+    ).order_by().values('warranty__store').annotate(
+        approved=Count('id', filter=Q(status='Approved')),
+        rejected=Count('id', filter=Q(status='Rejected')),
+        pending=Count('id', filter=Q(status='In Review')),
+    )
+    
+    def bucket(name):
+        # Stores without claims have no subquery row
+        return Coalesce(Subquery(claim_stats.values(name)[:1], output_field=IntegerField()), 0)
+    
+    return {
+        'approved_claims_count': bucket('approved'),
+        'rejected_claims_count': bucket('rejected'),
+        'pending_claims_count': bucket('pending'),
+    }
+
+
+def refresh_store_claim_counts(*store_ids):
+    """Recount the denormalized claim counts of the given stores in one UPDATE"""
+    store_ids = [store_id for store_id in store_ids if store_id is not None]
+    if store_ids:
+        Store.objects.filter(pk__in=store_ids).update(**claim_count_subqueries())
@@ -1,15 +1,168 @@
 from rest_framework import viewsets, permissions, status, generics
 from rest_framework.decorators import action
 from rest_framework.response import Response
+from rest_framework.pagination import CursorPagination
 from .models import Store
-from .serializers import StoreSerializer, StoreListSerializer, StoreDetailSerializer
-from django.db.models import Count, Q, Avg, Sum, F, Case, When, FloatField, ExpressionWrapper
+from .serializers import (
+    StoreSerializer, StoreListSerializer, StoreDetailSerializer, StoreActivitySerializer,
+    admins_prefetch,
+)
+from .utils import (
+    STORE_STATS_CACHE_TIMEOUT, STORE_ACTIVITY_CACHE_TIMEOUT, SECONDS_PER_DAY,
+    store_statistics_cache_key, store_activity_cache_key, public_store_cache_prefix,
+)
+from django.db.models import (
+    Count, Q, Avg, Sum, F, FloatField, ExpressionWrapper, DurationField,
+    Value, CharField, IntegerField, DecimalField, Prefetch, OuterRef, Subquery,
+)
+from django.db.models.functions import Cast, Coalesce, NullIf, Round
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
 from django.utils import timezone
+from django.utils.decorators import method_decorator
+from django.views.decorators.cache import cache_page
 from datetime import timedelta, datetime
+from functools import wraps
 from receipts.models import Receipt
 from warranties.models import Warranty
 from claims.models import Claim
 
+User = get_user_model()
+
+# Claim statuses counted as resolved in the dashboard resolution time
+RESOLVED_CLAIM_STATUSES = ['Approved', 'Rejected']
+
+
+def _per_store_subqueries(queryset, store_lookup, counts=(), **aggregates):
+    """
+    One correlated subquery per aggregate name, each grouping the outer store's
+    `queryset` rows and selecting that single figure. Every row is counted once,
+    so no DISTINCT is needed; names in `counts` default to 0 for stores without rows.
+    """
+    stats = queryset.filter(**{store_lookup: OuterRef('pk')}).order_by().values(
+        store_lookup
+    ).annotate(**aggregates)
+    
+    subqueries = {}
+    for name in aggregates:
+        subquery = Subquery(stats.values(name)[:1])
+        subqueries[name] = Coalesce(subquery, 0) if name in counts else subquery
+    return subqueries
+
+
+# Figures of store_statistics_annotations read by StoreViewSet._get_list_statistics
+STORE_LIST_STATISTICS = (
+    'receipts_this_month', 'receipts_last_month', 'warranties_this_month', 'open_claims_this_month',
+)
+
+
+def store_statistics_annotations(now, keys=None):
+    """
+    Dashboard annotations for StoreViewSet, so the statistics of every store come
+    back with the store row instead of a COUNT query per figure per store.
+    Each figure is its own correlated subquery over the store's receipts, warranties
+    or claims, computed with a conditional COUNT(...) FILTER (WHERE ...) or AVG.
+    Pass `keys` to annotate only those figures.
+    """
+    this_month_start = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+    last_month_start = (this_month_start - timedelta(days=1)).replace(day=1)
+    last_month_end = this_month_start - timedelta(seconds=1)
+    resolution_time = ExpressionWrapper(
+        F('updated_at') - F('submitted_at'),
+        output_field=DurationField()
+    )
+    
+    annotations = {
+        # Receipts issued this month and last month
+        **_per_store_subqueries(
+            Receipt.objects.all(), 'store',
+            counts=('receipts_this_month', 'receipts_last_month'),
+            receipts_this_month=Count('id', filter=Q(date__gte=this_month_start)),
+            receipts_last_month=Count(
+                'id',
+                filter=Q(date__gte=last_month_start, date__lte=last_month_end)
+            ),
+        ),
+        # Warranties active now and at the end of last month
+        **_per_store_subqueries(
+            Warranty.objects.all(), 'store',
+            counts=('warranties_this_month', 'warranties_last_month'),
+            warranties_this_month=Count('id', filter=Q(expiry_date__gte=now.date())),
+            warranties_last_month=Count('id', filter=Q(expiry_date__gte=last_month_end.date())),
+        ),
+        **_per_store_subqueries(
+            Claim.objects.all(), 'warranty__store',
+            counts=('open_claims_this_month', 'open_claims_last_month'),
+            # Open claims overall and those submitted last month
+            open_claims_this_month=Count('id', filter=Q(status='In Review')),
+            open_claims_last_month=Count(
+                'id',
+                filter=Q(
+                    status='In Review',
+                    submitted_at__gte=last_month_start,
+                    submitted_at__lte=last_month_end
+                )
+            ),
+            # Average time from submission to the last update of resolved claims
+            avg_resolution_this_month=Avg(
+                resolution_time,
+                filter=Q(status__in=RESOLVED_CLAIM_STATUSES, updated_at__gte=this_month_start)
+            ),
+            avg_resolution_last_month=Avg(
+                resolution_time,
+                filter=Q(
+                    status__in=RESOLVED_CLAIM_STATUSES,
+                    updated_at__gte=last_month_start,
+                    updated_at__lte=last_month_end
+                )
+            ),
+        ),
+    }
+    if keys is not None:
+        annotations = {key: annotations[key] for key in keys}
+    return annotations
+
+
+# Columns shared by the claim, receipt and warranty branches of the recent
+# activity UNION ALL; every branch annotates all of them in this order
+ACTIVITY_COLUMNS = (
+    'activity_kind', 'activity_timestamp', 'activity_number', 'activity_claim_status',
+    'activity_product', 'activity_customer_email', 'activity_amount', 'activity_coverage',
+    'activity_retailer_name', 'activity_retailer_email',
+)
+
+
+def _activity_columns(kind, timestamp, retailer, number=None, claim_status=None,
+                      product=None, customer_email=None, amount=None, coverage=None):
+    """
+    Annotations for one branch of the recent activity union; columns a branch
+    does not have are NULLs cast to the column type so all branches line up
+    """
+    def column(expression, output_field):
+        if expression is None:
+            return Cast(Value(None), output_field=output_field)
+        return expression
+    
+    return {
+        'activity_kind': Value(kind, output_field=IntegerField()),
+        'activity_timestamp': timestamp,
+        'activity_number': column(number, CharField()),
+        'activity_claim_status': column(claim_status, CharField()),
+        'activity_product': column(product, CharField()),
+        'activity_customer_email': column(customer_email, CharField()),
+        'activity_amount': column(amount, DecimalField(max_digits=10, decimal_places=2)),
+        'activity_coverage': column(coverage, IntegerField()),
+        'activity_retailer_name': F(f'{retailer}__full_name'),
+        'activity_retailer_email': F(f'{retailer}__email'),
+    }
+
+
+def _duration_in_days(duration):
+    """Convert an averaged duration to days rounded to one decimal, 0 if there was none"""
+    if duration is None:
+        return 0
+    return round(duration.total_seconds() / SECONDS_PER_DAY, 1)
+
 
 class IsAdminOrStoreAdmin(permissions.BasePermission):
     """
@@ -35,13 +188,21 @@ class StoreViewSet(viewsets.ModelViewSet):
     
     def get_queryset(self):
         user = self.request.user
-        # Prefetch admins to avoid N+1 queries
         if user.role == 'admin':
-            return Store.objects.prefetch_related('admins').all()
+            queryset = Store.objects.all()
         elif user.role == 'retailer':
             # Retailers can only see stores they manage
-            return user.managed_stores.prefetch_related('admins').all()
-        return Store.objects.none()
+            queryset = user.managed_stores.all()
+        else:
+            return Store.objects.none()
+        
+        if self.action == 'dashboard':
+            # The dashboard only needs the store id and its admin ids (permission check)
+            return queryset.only('id').prefetch_related(
+                Prefetch('admins', queryset=User.objects.only('id'))
+            )
+        # Prefetch admins to avoid N+1 queries
+        return queryset.prefetch_related(admins_prefetch())
     
     def list(self, request, *args, **kwargs):
         """
@@ -51,27 +212,17 @@ class StoreViewSet(viewsets.ModelViewSet):
         queryset = self.filter_queryset(self.get_queryset())
         
         # If retailer, include dashboard statistics
-        if request.user.role == 'retailer' and queryset.exists():
-            # Get all store IDs
-            store_ids = list(queryset.values_list('id', flat=True))
+        if request.user.role == 'retailer':
+            # Statistics for all stores come back with the stores in one query
+            # The queryset is evaluated once and serialized in one pass
+            stores = list(queryset.annotate(
+                **store_statistics_annotations(timezone.now(), keys=STORE_LIST_STATISTICS)
+            ))
             
-            # Bulk calculate statistics for all stores at once
-            stats_by_store = self._get_bulk_store_statistics(store_ids)
-            
-            stores_with_stats = []
-            for store in queryset:
-                serializer = self.get_serializer(store)
-                store_data = serializer.data
-                
-                # Attach pre-calculated statistics
-                store_stats = stats_by_store.get(store.id, {
-                    'statistics': {},
-                    'recent_activity': []
-                })
-                store_data['statistics'] = store_stats['statistics']
-                store_data['recent_activity'] = store_stats['recent_activity']
-                
-                stores_with_stats.append(store_data)
+            stores_with_stats = self.get_serializer(stores, many=True).data
+            for store, store_data in zip(stores, stores_with_stats):
+                store_data['statistics'] = self._get_list_statistics(store)
+                store_data['recent_activity'] = []  # Recent activity can be added if needed
             
             return Response(stores_with_stats)
         
@@ -79,213 +230,190 @@ class StoreViewSet(viewsets.ModelViewSet):
         serializer = self.get_serializer(queryset, many=True)
         return Response(serializer.data)
     
-    def _get_store_statistics(self, store):
+    def _get_store_statistics(self, store, *, now=None):
         """
         Get dashboard statistics for a store (helper method)
+        Statistics and recent activity are cached briefly per store and
+        invalidated when the store's receipts, warranties or claims change.
+        Pass `now` to share the same time windows across several stores.
         """
-        now = timezone.now()
+        now = now or timezone.now()
         
-        # Define time periods
-        this_month_start = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
-        last_month_start = (this_month_start - timedelta(days=1)).replace(day=1)
-        last_month_end = this_month_start - timedelta(seconds=1)
+        statistics_key = store_statistics_cache_key(store.id)
+        statistics = cache.get(statistics_key)
+        if statistics is None:
+            statistics = self._compute_store_statistics(store, now)
+            cache.set(statistics_key, statistics, STORE_STATS_CACHE_TIMEOUT)
         
-        # STATISTICS
+        activity_key = store_activity_cache_key(store.id)
+        recent_activity = cache.get(activity_key)
+        if recent_activity is None:
+            recent_activity = self._get_recent_activity(store, now)
+            cache.set(activity_key, recent_activity, STORE_ACTIVITY_CACHE_TIMEOUT)
         
-        # 1. Total Receipts Issued
-        receipts_this_month = Receipt.objects.filter(
-            store=store,
-            date__gte=this_month_start
-        ).count()
-        
-        receipts_last_month = Receipt.objects.filter(
-            store=store,
-            date__gte=last_month_start,
-            date__lte=last_month_end
-        ).count()
+        return {
+            'statistics': statistics,
+            # time_ago is relative to this request (cached entries keep raw timestamps)
+            'recent_activity': StoreActivitySerializer(
+                recent_activity, many=True, context={'now': now}
+            ).data
+        }
+    
+    def _compute_store_statistics(self, store, now):
+        """
+        Dashboard statistics for a store, aggregated in a single query
+        """
+        annotations = store_statistics_annotations(now)
+        counts = Store.objects.filter(pk=store.pk).annotate(
+            **annotations
+        ).values(*annotations).get()
         
+        # 1. Total Receipts Issued
+        receipts_this_month = counts['receipts_this_month']
+        receipts_last_month = counts['receipts_last_month']
         receipts_change = self._calculate_percentage_change(receipts_this_month, receipts_last_month)
         
-        # 2. Active Warranties
-        warranties_this_month = Warranty.objects.filter(
-            receipt_item__receipt__store=store,
-            expiry_date__gte=now.date()
-        ).count()
-        
-        # Warranties that were active last month
-        last_month_date = last_month_end.date()
-        warranties_last_month = Warranty.objects.filter(
-            receipt_item__receipt__store=store,
-            expiry_date__gte=last_month_date
-        ).count()
-        
+        # 2. Active Warranties (compared with warranties active last month)
+        warranties_this_month = counts['warranties_this_month']
+        warranties_last_month = counts['warranties_last_month']
         warranties_change = self._calculate_percentage_change(warranties_this_month, warranties_last_month)
         
         # 3. Open Claims
-        open_claims_this_month = Claim.objects.filter(
-            warranty__receipt_item__receipt__store=store,
-            status='In Review'
-        ).count()
-        
-        open_claims_last_month = Claim.objects.filter(
-            warranty__receipt_item__receipt__store=store,
-            status='In Review',
-            submitted_at__gte=last_month_start,
-            submitted_at__lte=last_month_end
-        ).count()
-        
+        open_claims_this_month = counts['open_claims_this_month']
+        open_claims_last_month = counts['open_claims_last_month']
         claims_change = self._calculate_percentage_change(open_claims_this_month, open_claims_last_month)
         
-        # 4. Average Resolution Time
-        resolved_claims_this_month = Claim.objects.filter(
-            warranty__receipt_item__receipt__store=store,
-            status__in=['Approved', 'Rejected'],
-            updated_at__gte=this_month_start
-        )
-        
-        avg_resolution_this_month = 0
-        if resolved_claims_this_month.exists():
-            total_days = 0
-            for claim in resolved_claims_this_month:
-                resolution_time = (claim.updated_at - claim.submitted_at).total_seconds() / 86400
-                total_days += resolution_time
-            avg_resolution_this_month = round(total_days / resolved_claims_this_month.count(), 1)
-        
-        resolved_claims_last_month = Claim.objects.filter(
-            warranty__receipt_item__receipt__store=store,
-            status__in=['Approved', 'Rejected'],
-            updated_at__gte=last_month_start,
-            updated_at__lte=last_month_end
-        )
-        
-        avg_resolution_last_month = 0
-        if resolved_claims_last_month.exists():
-            total_days = 0
-            for claim in resolved_claims_last_month:
-                resolution_time = (claim.updated_at - claim.submitted_at).total_seconds() / 86400
-                total_days += resolution_time
-            avg_resolution_last_month = round(total_days / resolved_claims_last_month.count(), 1)
+        # 4. Average Resolution Time (averaged in the database)
+        avg_resolution_this_month = _duration_in_days(counts['avg_resolution_this_month'])
+        avg_resolution_last_month = _duration_in_days(counts['avg_resolution_last_month'])
         
         resolution_change = self._calculate_percentage_change(avg_resolution_this_month, avg_resolution_last_month, inverse=True)
         
-        # RECENT ACTIVITY (Last 24 hours)
-        # Only show activities performed by store's retailer admins
-        recent_activity = []
+        return {
+            'total_receipts': {
+                'value': receipts_this_month,
+                'change': receipts_change,
+                'label': 'Total Receipts Issued'
+            },
+            'active_warranties': {
+                'value': warranties_this_month,
+                'change': warranties_change,
+                'label': 'Active Warranties'
+            },
+            'open_claims': {
+                'value': open_claims_this_month,
+                'change': claims_change,
+                'label': 'Open Claims'
+            },
+            'avg_resolution_time': {
+                'value': avg_resolution_this_month,
+                'unit': 'days',
+                'change': resolution_change,
+                'label': 'Avg. Resolution Time'
+            }
+        }
+    
+    def _get_recent_activity(self, store, now):
+        """
+        Up to 10 most recent activities (last 24 hours) of the store's retailer admins,
+        newest first, each with its raw timestamp.
+        Claims, receipts and warranties are combined with UNION ALL, so the database
+        sorts and limits the activity stream in a single query.
+        """
         last_24h = now - timedelta(hours=24)
         
-        # Get store admins (retailers)
-        store_admins = store.admins.all()
+        # Only show activities performed by store's retailer admins
+        # (admin ids come from the prefetched admins, not a subquery per branch)
+        admin_ids = [admin.pk for admin in store.admins.all()]
+        if not admin_ids:
+            return []
         
         # Recent Claims (Approved/Rejected by store retailers)
         recent_claims = Claim.objects.filter(
-            warranty__receipt_item__receipt__store=store,
-            warranty__receipt_item__receipt__retailer__in=store_admins,
+            warranty__store=store,
+            warranty__retailer_id__in=admin_ids,
             updated_at__gte=last_24h
-        ).exclude(status='In Review').select_related(
-            'warranty__receipt_item__receipt__retailer'
-        ).order_by('-updated_at')[:10]
-        
-        for claim in recent_claims:
-            activity_type = 'claim_approved' if claim.status == 'Approved' else 'claim_rejected'
-            retailer_name = claim.warranty.receipt_item.receipt.retailer.full_name or claim.warranty.receipt_item.receipt.retailer.email
-            recent_activity.append({
-                'type': activity_type,
-                'title': f"Claim #{claim.claim_number} {claim.status}",
-                'description': f"{claim.product_name} warranty claim",
-                'timestamp': claim.updated_at,
-                'status': claim.status,
-                'icon': 'check' if claim.status == 'Approved' else 'x',
-                'performed_by': retailer_name
-            })
+        ).exclude(status='In Review').annotate(**_activity_columns(
+            kind=0,
+            timestamp=F('updated_at'),
+            number=F('claim_number'),
+            claim_status=F('status'),
+            product=F('warranty__receipt_item__product_name'),
+            retailer='warranty__retailer',
+        ))
         
         # Recent Receipts (sent by store retailers)
         recent_receipts = Receipt.objects.filter(
             store=store,
-            retailer__in=store_admins,
+            retailer_id__in=admin_ids,
             created_at__gte=last_24h
-        ).select_related('retailer', 'customer').order_by('-created_at')[:10]
-        
-        for receipt in recent_receipts:
-            retailer_name = receipt.retailer.full_name or receipt.retailer.email
-            recent_activity.append({
-                'type': 'receipt_sent',
-                'title': f"Receipt sent to {receipt.customer.email}",
-                'description': f"Receipt #{receipt.receipt_number} - ${receipt.total}",
-                'timestamp': receipt.created_at,
-                'status': None,
-                'icon': 'dollar',
-                'performed_by': retailer_name
-            })
+        ).annotate(**_activity_columns(
+            kind=1,
+            timestamp=F('created_at'),
+            number=F('receipt_number'),
+            customer_email=F('customer__email'),
+            amount=F('total'),
+            retailer='retailer',
+        ))
         
         # Recent Warranties (registered by store retailers)
         recent_warranties = Warranty.objects.filter(
-            receipt_item__receipt__store=store,
-            receipt_item__receipt__retailer__in=store_admins,
+            store=store,
+            retailer_id__in=admin_ids,
             created_at__gte=last_24h
-        ).select_related(
-            'receipt_item__receipt__retailer',
-            'receipt_item'
-        ).order_by('-created_at')[:10]
-        
-        for warranty in recent_warranties:
-            retailer_name = warranty.receipt_item.receipt.retailer.full_name or warranty.receipt_item.receipt.retailer.email
-            recent_activity.append({
-                'type': 'warranty_registered',
-                'title': "New warranty registered",
-                'description': f"{warranty.receipt_item.product_name} - {warranty.coverage_period_months} months coverage",
-                'timestamp': warranty.created_at,
-                'status': None,
-                'icon': 'shield',
-                'performed_by': retailer_name
-            })
+        ).annotate(**_activity_columns(
+            kind=2,
+            timestamp=F('created_at'),
+            product=F('receipt_item__product_name'),
+            coverage=F('coverage_period_months'),
+            retailer='retailer',
+        ))
+        
+        # Newest first; on equal timestamps claims come before receipts before warranties.
+        # Branches drop their Meta.ordering: only the outer query sorts
+        rows = recent_claims.order_by().values(*ACTIVITY_COLUMNS).union(
+            recent_receipts.order_by().values(*ACTIVITY_COLUMNS),
+            recent_warranties.order_by().values(*ACTIVITY_COLUMNS),
+            all=True
+        ).order_by('-activity_timestamp', 'activity_kind')[:10]
         
-        # Sort all activities by timestamp
-        recent_activity.sort(key=lambda x: x['timestamp'], reverse=True)
-        
-        # Format timestamps
-        for activity in recent_activity[:10]:  # Limit to 10 most recent
-            time_diff = now - activity['timestamp']
-            if time_diff < timedelta(minutes=1):
-                activity['time_ago'] = 'Just now'
-            elif time_diff < timedelta(hours=1):
-                minutes = int(time_diff.total_seconds() / 60)
-                activity['time_ago'] = f"{minutes} minute{'s' if minutes != 1 else ''} ago"
-            elif time_diff < timedelta(days=1):
-                hours = int(time_diff.total_seconds() / 3600)
-                activity['time_ago'] = f"{hours} hour{'s' if hours != 1 else ''} ago"
+        recent_activity = []
+        for row in rows:
+            retailer_name = row['activity_retailer_name'] or row['activity_retailer_email']
+            kind = row['activity_kind']
+            if kind == 0:
+                claim_status = row['activity_claim_status']
+                recent_activity.append({
+                    'type': 'claim_approved' if claim_status == 'Approved' else 'claim_rejected',
+                    'title': f"Claim #{row['activity_number']} {claim_status}",
+                    'description': f"{row['activity_product']} warranty claim",
+                    'timestamp': row['activity_timestamp'],
+                    'status': claim_status,
+                    'icon': 'check' if claim_status == 'Approved' else 'x',
+                    'performed_by': retailer_name
+                })
+            elif kind == 1:
+                recent_activity.append({
+                    'type': 'receipt_sent',
+                    'title': f"Receipt sent to {row['activity_customer_email']}",
+                    'description': f"Receipt #{row['activity_number']} - ${row['activity_amount']}",
+                    'timestamp': row['activity_timestamp'],
+                    'status': None,
+                    'icon': 'dollar',
+                    'performed_by': retailer_name
+                })
             else:
-                days = time_diff.days
-                activity['time_ago'] = f"{days} day{'s' if days != 1 else ''} ago"
-            
-            # Remove timestamp from final output
-            del activity['timestamp']
+                recent_activity.append({
+                    'type': 'warranty_registered',
+                    'title': "New warranty registered",
+                    'description': f"{row['activity_product']} - {row['activity_coverage']} months coverage",
+                    'timestamp': row['activity_timestamp'],
+                    'status': None,
+                    'icon': 'shield',
+                    'performed_by': retailer_name
+                })
         
-        return {
-            'statistics': {
-                'total_receipts': {
-                    'value': receipts_this_month,
-                    'change': receipts_change,
-                    'label': 'Total Receipts Issued'
-                },
-                'active_warranties': {
-                    'value': warranties_this_month,
-                    'change': warranties_change,
-                    'label': 'Active Warranties'
-                },
-                'open_claims': {
-                    'value': open_claims_this_month,
-                    'change': claims_change,
-                    'label': 'Open Claims'
-                },
-                'avg_resolution_time': {
-                    'value': avg_resolution_this_month,
-                    'unit': 'days',
-                    'change': resolution_change,
-                    'label': 'Avg. Resolution Time'
-                }
-            },
-            'recent_activity': recent_activity[:10]
-        }
+        return recent_activity
     
     @action(detail=True, methods=['get'])
     def dashboard(self, request, pk=None):
@@ -297,93 +425,44 @@ class StoreViewSet(viewsets.ModelViewSet):
         stats = self._get_store_statistics(store)
         return Response(stats)
     
-    def _get_bulk_store_statistics(self, store_ids):
+    def _get_list_statistics(self, store):
         """
-        Get dashboard statistics for multiple stores at once (optimized bulk query)
-        Returns a dictionary with store_id as key
+        Summary statistics shown with each store in the retailer store list,
+        read from store_statistics_annotations
         """
-        now = timezone.now()
-        this_month_start = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
-        last_month_start = (this_month_start - timedelta(days=1)).replace(day=1)
-        last_month_end = this_month_start - timedelta(seconds=1)
-        last_24h = now - timedelta(hours=24)
-        
-        stats_by_store = {}
-        
-        # Bulk query for receipts this month
-        receipts_this_month = Receipt.objects.filter(
-            store_id__in=store_ids,
-            date__gte=this_month_start
-        ).values('store_id').annotate(count=Count('id'))
-        receipts_this_month_dict = {r['store_id']: r['count'] for r in receipts_this_month}
-        
-        # Bulk query for receipts last month
-        receipts_last_month = Receipt.objects.filter(
-            store_id__in=store_ids,
-            date__gte=last_month_start,
-            date__lte=last_month_end
-        ).values('store_id').annotate(count=Count('id'))
-        receipts_last_month_dict = {r['store_id']: r['count'] for r in receipts_last_month}
-        
-        # Bulk query for active warranties
-        warranties_this_month = Warranty.objects.filter(
-            receipt_item__receipt__store_id__in=store_ids,
-            expiry_date__gte=now.date()
-        ).values('receipt_item__receipt__store_id').annotate(count=Count('id'))
-        warranties_this_month_dict = {w['receipt_item__receipt__store_id']: w['count'] for w in warranties_this_month}
-        
-        # Bulk query for open claims
-        open_claims = Claim.objects.filter(
-            warranty__receipt_item__receipt__store_id__in=store_ids,
-            status='In Review'
-        ).values('warranty__receipt_item__receipt__store_id').annotate(count=Count('id'))
-        open_claims_dict = {c['warranty__receipt_item__receipt__store_id']: c['count'] for c in open_claims}
-        
-        # Build statistics for each store
-        for store_id in store_ids:
-            receipts_current = receipts_this_month_dict.get(store_id, 0)
-            receipts_previous = receipts_last_month_dict.get(store_id, 0)
-            warranties_current = warranties_this_month_dict.get(store_id, 0)
-            open_claims_count = open_claims_dict.get(store_id, 0)
-            
-            stats_by_store[store_id] = {
-                'statistics': {
-                    'total_receipts': {
-                        'value': receipts_current,
-                        'change': self._calculate_percentage_change(receipts_current, receipts_previous),
-                        'label': 'Total Receipts Issued'
-                    },
-                    'active_warranties': {
-                        'value': warranties_current,
-                        'change': 0.0,  # Simplified for bulk query
-                        'label': 'Active Warranties'
-                    },
-                    'open_claims': {
-                        'value': open_claims_count,
-                        'change': 0.0,  # Simplified for bulk query
-                        'label': 'Open Claims'
-                    },
-                    'avg_resolution_time': {
-                        'value': 0.0,  # Simplified for bulk query
-                        'unit': 'days',
-                        'change': 0.0,
-                        'label': 'Avg. Resolution Time'
-                    }
-                },
-                'recent_activity': []  # Recent activity can be added if needed
+        return {
+            'total_receipts': {
+                'value': store.receipts_this_month,
+                'change': self._calculate_percentage_change(store.receipts_this_month, store.receipts_last_month),
+                'label': 'Total Receipts Issued'
+            },
+            'active_warranties': {
+                'value': store.warranties_this_month,
+                'change': 0.0,  # Simplified for list view
+                'label': 'Active Warranties'
+            },
+            'open_claims': {
+                'value': store.open_claims_this_month,
+                'change': 0.0,  # Simplified for list view
+                'label': 'Open Claims'
+            },
+            'avg_resolution_time': {
+                'value': 0.0,  # Simplified for list view
+                'unit': 'days',
+                'change': 0.0,
+                'label': 'Avg. Resolution Time'
             }
-        
-        return stats_by_store
+        }
     
     def _calculate_percentage_change(self, current, previous, inverse=False):
         """
         Calculate percentage change between two values
         inverse=True means lower is better (like resolution time)
         """
-        if previous == 0:
-            if current > 0:
-                return 100.0
+        if current == previous:
             return 0.0
+        if previous == 0:
+            return 100.0 if current > 0 else 0.0
         
         change = ((current - previous) / previous) * 100
         
@@ -395,46 +474,92 @@ class StoreViewSet(viewsets.ModelViewSet):
 
 # ==================== PUBLIC STORE APIs ====================
 
+# Public store responses are identical for every visitor, so they are cached briefly
+PUBLIC_STORE_CACHE_TIMEOUT = 60  # seconds
+
+# Store columns rendered by StoreListSerializer
+STORE_LIST_FIELDS = (
+    'id', 'name', 'image', 'phone_number', 'email', 'address',
+    'latitude', 'longitude', 'is_verified', 'created_at',
+    'approved_claims_count', 'rejected_claims_count', 'pending_claims_count'
+)
+
+
+def claim_statistics_annotations():
+    """
+    Claim count annotations shared by the public store views.
+    The per-status counts are denormalized Store columns (see store.signals), so only
+    the resolved total is derived here.
+    """
+    return {
+        # Total resolved claims (Approved + Rejected)
+        'total_claims_count': F('approved_claims_count') + F('rejected_claims_count'),
+    }
+
+
+def success_rate_annotation():
+    """
+    Success rate (approval rate) computed from the claim count annotations,
+    rounded to one decimal place in the database
+    """
+    # NULLIF turns a zero total into NULL, which the division propagates
+    return Round(
+        ExpressionWrapper(
+            F('approved_claims_count') * 100.0 / NullIf(F('total_claims_count'), 0),
+            output_field=FloatField()
+        ),
+        1
+    )
+
+
+def public_store_queryset():
+    """
+    Stores with the columns and claim statistics StoreListSerializer renders, newest first
+    """
+    return Store.objects.only(*STORE_LIST_FIELDS).annotate(
+        **claim_statistics_annotations()
+    ).annotate(
+        calculated_success_rate=success_rate_annotation()
+    ).order_by('-created_at')
+
+
+def cache_public_store_page(view):
+    """
+    cache_page under the current public store version, so store and claim
+    changes (see store.signals) drop the cached responses before they expire
+    """
+    @wraps(view)
+    def cached_view(request, *args, **kwargs):
+        return cache_page(
+            PUBLIC_STORE_CACHE_TIMEOUT, key_prefix=public_store_cache_prefix()
+        )(view)(request, *args, **kwargs)
+    return cached_view
+
+
+class PublicStorePagination(CursorPagination):
+    """
+    Cursor pagination for the public store list, so a page never loads the whole table
+    """
+    page_size = 50
+    ordering = '-created_at'
+
+
+@method_decorator(cache_public_store_page, name='dispatch')
 class PublicStoreListView(generics.ListAPIView):
     """
     Public API to list all stores with map URLs.
     No authentication required - accessible to everyone.
     Optimized with annotations to prevent N+1 queries.
+    Responses are cached per URL (including query params) until a store or claim changes.
+    Results are cursor-paginated, newest stores first.
     """
     serializer_class = StoreListSerializer
     permission_classes = [permissions.AllowAny]
+    pagination_class = PublicStorePagination
     
     def get_queryset(self):
         # Annotate with claim statistics to prevent N+1 queries
-        queryset = Store.objects.annotate(
-            # Total resolved claims (Approved + Rejected)
-            total_claims_count=Count(
-                'receipts__items__warranty__claims',
-                filter=~Q(receipts__items__warranty__claims__status='In Review'),
-                distinct=True
-            ),
-            # Approved claims count
-            approved_claims_count=Count(
-                'receipts__items__warranty__claims',
-                filter=Q(receipts__items__warranty__claims__status='Approved'),
-                distinct=True
-            ),
-            # Rejected claims count
-            rejected_claims_count=Count(
-                'receipts__items__warranty__claims',
-                filter=Q(receipts__items__warranty__claims__status='Rejected'),
-                distinct=True
-            ),
-            # Success rate calculation
-            calculated_success_rate=Case(
-                When(total_claims_count=0, then=None),
-                default=ExpressionWrapper(
-                    F('approved_claims_count') * 100.0 / F('total_claims_count'),
-                    output_field=FloatField()
-                ),
-                output_field=FloatField()
-            )
-        ).order_by('-created_at')
+        queryset = public_store_queryset()
         
         # Optional search filter
         search = self.request.query_params.get('search', None)
@@ -457,51 +582,24 @@ class PublicStoreListView(generics.ListAPIView):
         return queryset
 
 
+@method_decorator(cache_public_store_page, name='dispatch')
 class PublicStoreDetailView(generics.RetrieveAPIView):
     """
     Public API to get store details with map URLs.
     No authentication required - accessible to everyone.
     Optimized with annotations to prevent N+1 queries.
+    Responses are cached per URL (including query params) until a store or claim changes.
     """
     serializer_class = StoreDetailSerializer
     permission_classes = [permissions.AllowAny]
     
     def get_queryset(self):
-        # Annotate with claim statistics and prefetch admins
+        # Annotate with claim statistics and admin count
+        # (StoreDetailSerializer only exposes the count, so admins are not prefetched)
         return Store.objects.annotate(
-            # Total resolved claims (Approved + Rejected)
-            total_claims_count=Count(
-                'receipts__items__warranty__claims',
-                filter=~Q(receipts__items__warranty__claims__status='In Review'),
-                distinct=True
-            ),
-            # Approved claims count
-            approved_claims_count=Count(
-                'receipts__items__warranty__claims',
-                filter=Q(receipts__items__warranty__claims__status='Approved'),
-                distinct=True
-            ),
-            # Rejected claims count
-            rejected_claims_count=Count(
-                'receipts__items__warranty__claims',
-                filter=Q(receipts__items__warranty__claims__status='Rejected'),
-                distinct=True
-            ),
-            # Pending claims count
-            pending_claims_count=Count(
-                'receipts__items__warranty__claims',
-                filter=Q(receipts__items__warranty__claims__status='In Review'),
-                distinct=True
-            ),
-            # Success rate calculation
-            calculated_success_rate=Case(
-                When(total_claims_count=0, then=None),
-                default=ExpressionWrapper(
-                    F('approved_claims_count') * 100.0 / F('total_claims_count'),
-                    output_field=FloatField()
-                ),
-                output_field=FloatField()
-            ),
+            **claim_statistics_annotations(),
             # Admin count
             admin_count_annotated=Count('admins', distinct=True)
-        ).prefetch_related('admins')
+        ).annotate(
+            calculated_success_rate=success_rate_annotation()
+        )
@@ -1,16 +1,47 @@
 from django.contrib import admin
+from django.db.models import Exists, OuterRef
+from django.utils import timezone
+from datetime import timedelta
 from .models import Warranty, CustomerWarranty
 from receipts.models import ReceiptItem
 
+
+class ExpiryBucketFilter(admin.SimpleListFilter):
+    """
+    Coverage filter on expiry_date with fixed choices, so rendering it needs no query
+    """
+    title = 'coverage'
+    parameter_name = 'coverage'
+    
+    def lookups(self, request, model_admin):
+        return (
+            ('active', 'Active'),
+            ('expiring_soon', 'Expiring within 30 days'),
+            ('expired', 'Expired'),
+        )
+    
+    def queryset(self, request, queryset):
+        today = timezone.now().date()
+        if self.value() == 'active':
+            return queryset.filter(expiry_date__gte=today)
+        if self.value() == 'expiring_soon':
+            return queryset.filter(expiry_date__gte=today, expiry_date__lte=today + timedelta(days=30))
+        if self.value() == 'expired':
+            return queryset.filter(expiry_date__lt=today)
+        return queryset
+
+
 @admin.register(Warranty)
 class WarrantyAdmin(admin.ModelAdmin):
     list_display = ['id', 'get_product_name', 'get_customer', 'get_retailer', 'get_serial_number', 'purchase_date', 'expiry_date', 'get_status', 'created_at']
-    list_filter = ['purchase_date', 'expiry_date', 'created_at']
-    search_fields = ['receipt_item__product_name', 'receipt_item__serial_number', 'receipt_item__receipt__customer__username', 'receipt_item__receipt__customer__email']
+    list_filter = [ExpiryBucketFilter, 'purchase_date', 'created_at']
+    # Customer email and username are matched by prefix (served by the user_*_upper_prefix_idx indexes)
+    search_fields = ['receipt_item__product_name', 'receipt_item__serial_number', '^customer__email', '^customer__username']
     ordering = ['-created_at']
-    date_hierarchy = 'purchase_date'
     readonly_fields = ['created_at', 'updated_at', 'get_customer', 'get_retailer', 'get_product_name', 'get_serial_number', 'get_status', 'remaining_days', 'coverage_value', 'claims_count']
     autocomplete_fields = ['receipt_item']
+    # Product column reads receipt_item; customer and retailer are direct foreign keys
+    list_select_related = ['receipt_item', 'customer', 'retailer']
     
     def formfield_for_foreignkey(self, db_field, request, **kwargs):
         """
@@ -18,7 +49,10 @@ class WarrantyAdmin(admin.ModelAdmin):
         """
         if db_field.name == "receipt_item":
             # When adding a new warranty, only show receipt items without a warranty
-            kwargs["queryset"] = ReceiptItem.objects.filter(warranty__isnull=True)
+            # (NOT EXISTS probes the unique receipt_item_id index instead of an outer join)
+            kwargs["queryset"] = ReceiptItem.objects.filter(
+                ~Exists(Warranty.objects.filter(receipt_item=OuterRef('pk')))
+            ).select_related('receipt')
         return super().formfield_for_foreignkey(db_field, request, **kwargs)
     
     def get_fieldsets(self, request, obj=None):
@@ -58,50 +92,37 @@ class WarrantyAdmin(admin.ModelAdmin):
                 }),
             )
     
+    # Foreign key ids are checked instead of catching RelatedObjectDoesNotExist;
+    # customer and retailer are only unset on a warranty that has not been saved yet
     @admin.display(description='Product Name')
     def get_product_name(self, obj):
-        try:
-            return obj.receipt_item.product_name if obj.receipt_item else '-'
-        except:
-            return '-'
+        return obj.receipt_item.product_name if obj.receipt_item_id else '-'
     
     @admin.display(description='Serial Number')
     def get_serial_number(self, obj):
-        try:
-            return obj.receipt_item.serial_number if obj.receipt_item else '-'
-        except:
-            return '-'
+        return obj.receipt_item.serial_number if obj.receipt_item_id else '-'
     
     @admin.display(description='Customer')
     def get_customer(self, obj):
-        try:
-            return obj.customer.email if obj.customer else '-'
-        except:
-            return '-'
+        return obj.customer.email if obj.customer_id else '-'
     
     @admin.display(description='Retailer')
     def get_retailer(self, obj):
-        try:
-            return obj.retailer.email if obj.retailer else '-'
-        except:
-            return '-'
+        return obj.retailer.email if obj.retailer_id else '-'
     
     @admin.display(description='Status')
     def get_status(self, obj):
         """Display auto-calculated status"""
-        try:
-            return obj.status
-        except:
-            return '-'
+        return obj.status if obj.expiry_date else '-'
 
 
 @admin.register(CustomerWarranty)
 class CustomerWarrantyAdmin(admin.ModelAdmin):
     list_display = ['id', 'product_name', 'customer_email', 'expiry_date', 'get_status', 'created_at']
-    list_filter = ['expiry_date', 'created_at']
+    list_filter = [ExpiryBucketFilter, 'created_at']
     search_fields = ['product_name', 'customer__email', 'customer__username', 'notes']
     ordering = ['-created_at']
-    date_hierarchy = 'expiry_date'
+    list_select_related = ['customer']
     
     def get_readonly_fields(self, request, obj=None):
         """Make customer readonly only when editing, not when adding"""
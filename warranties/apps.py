@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class WarrantiesConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'warranties'
+
+    def ready(self):
+        # Invalidate cached warranty statistics when warranty data changes
+        from . import signals  # noqa: F401
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.7 on 2026-10-16 04:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('receipts', '0007_receipt_lookup_indexes'),
+        ('warranties', '0007_customerwarranty'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='warranty',
+            index=models.Index(fields=['expiry_date'], name='warranty_expiry_idx'),
+        ),
+    ]
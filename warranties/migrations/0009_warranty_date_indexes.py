@@ -0,0 +1,28 @@
+# Generated by Django 5.2.7 on 2026-10-16 04:49
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('receipts', '0007_receipt_lookup_indexes'),
+        ('warranties', '0008_warranty_expiry_idx'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='customerwarranty',
+            index=models.Index(fields=['expiry_date'], name='customer_warranty_expiry_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='warranty',
+            index=models.Index(fields=['-created_at'], name='warranty_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='warranty',
+            index=models.Index(fields=['purchase_date'], name='warranty_purchase_date_idx'),
+        ),
+    ]
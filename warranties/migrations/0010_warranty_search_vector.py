@@ -0,0 +1,46 @@
+# Generated by Django 5.2.7 on 2026-10-16 04:55
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.contrib.postgres.search import SearchVector, SearchVectorField
+from django.db import migrations
+from django.db.models import OuterRef, Subquery
+
+
+def backfill_search_vectors(apps, schema_editor):
+    """Build the search document of the existing warranties"""
+    Warranty = apps.get_model('warranties', 'Warranty')
+    ReceiptItem = apps.get_model('receipts', 'ReceiptItem')
+    
+    document = ReceiptItem.objects.filter(pk=OuterRef('receipt_item_id')).annotate(
+        document=(
+            SearchVector('product_name', weight='A', config='simple')
+            + SearchVector('serial_number', 'imei', weight='B', config='simple')
+            + SearchVector(
+                'receipt__customer__email', 'receipt__customer__first_name', 'receipt__customer__last_name',
+                weight='C', config='simple'
+            )
+        )
+    ).values('document')
+    Warranty.objects.update(search_vector=Subquery(document, output_field=SearchVectorField()))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('receipts', '0007_receipt_lookup_indexes'),
+        ('warranties', '0009_warranty_date_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='warranty',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='warranty',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='warranty_search_vector_idx'),
+        ),
+        migrations.RunPython(backfill_search_vectors, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,71 @@
+# Generated by Django 5.2.7 on 2026-10-16 06:12
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def backfill_receipt_parties(apps, schema_editor):
+    """Copy customer, retailer and store of each warranty's receipt"""
+    Warranty = apps.get_model('warranties', 'Warranty')
+    Receipt = apps.get_model('receipts', 'Receipt')
+
+    receipt = Receipt.objects.filter(items__warranty=OuterRef('pk'))
+    Warranty.objects.update(
+        customer_id=Subquery(receipt.values('customer_id')[:1]),
+        retailer_id=Subquery(receipt.values('retailer_id')[:1]),
+        store_id=Subquery(receipt.values('store_id')[:1]),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('receipts', '0008_receipt_item_device_id_indexes'),
+        ('store', '0005_store_claim_counts'),
+        ('warranties', '0010_warranty_search_vector'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='warranty',
+            name='customer',
+            field=models.ForeignKey(db_index=False, editable=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='warranties_as_customer', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddField(
+            model_name='warranty',
+            name='retailer',
+            field=models.ForeignKey(db_index=False, editable=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='warranties_as_retailer', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddField(
+            model_name='warranty',
+            name='store',
+            field=models.ForeignKey(editable=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='warranties', to='store.store'),
+        ),
+        migrations.RunPython(backfill_receipt_parties, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='warranty',
+            name='customer',
+            field=models.ForeignKey(db_index=False, editable=False, on_delete=django.db.models.deletion.CASCADE, related_name='warranties_as_customer', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AlterField(
+            model_name='warranty',
+            name='retailer',
+            field=models.ForeignKey(db_index=False, editable=False, on_delete=django.db.models.deletion.CASCADE, related_name='warranties_as_retailer', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AlterField(
+            model_name='warranty',
+            name='store',
+            field=models.ForeignKey(editable=False, on_delete=django.db.models.deletion.CASCADE, related_name='warranties', to='store.store'),
+        ),
+        migrations.AddIndex(
+            model_name='warranty',
+            index=models.Index(fields=['customer', 'expiry_date'], name='warranty_customer_expiry_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='warranty',
+            index=models.Index(fields=['retailer', 'expiry_date'], name='warranty_retailer_expiry_idx'),
+        ),
+    ]
@@ -1,11 +1,23 @@
 from django.db import models
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from receipts.models import ReceiptItem
+from store.models import Store
 from django.utils import timezone
+from django.utils.functional import cached_property
 from django.contrib.auth import get_user_model
 
 User = get_user_model()
 
 class Warranty(models.Model):
+    """
+    Warranty of a receipt item. customer, retailer and store are copies of the parties of
+    the item's receipt: save() copies them for a new or re-linked receipt_item, and
+    warranties.signals re-syncs them when a Receipt or ReceiptItem is saved.
+    QuerySet.update() and bulk_update() on Receipt or ReceiptItem send no signals; follow
+    them with warranties.signals.sync_receipt_parties() on the affected warranties (and
+    the refresh_store_claim_counts command when a store changed).
+    """
     # Link to receipt item (which contains the product with all details)
     # OneToOneField ensures each receipt item can only have one warranty
     receipt_item = models.OneToOneField(
@@ -15,6 +27,25 @@ class Warranty(models.Model):
         help_text='Each receipt item can only have one warranty'
     )
     
+    # Parties of the receipt, copied from receipt_item.receipt on save so role filters
+    # and permission checks need no join through receipt_item -> receipt.
+    # customer and retailer are indexed by the (party, expiry_date) indexes below
+    customer = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='warranties_as_customer',
+        editable=False,
+        db_index=False
+    )
+    retailer = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='warranties_as_retailer',
+        editable=False,
+        db_index=False
+    )
+    store = models.ForeignKey(Store, on_delete=models.CASCADE, related_name='warranties', editable=False)
+    
     # Warranty coverage details
     coverage_period_months = models.IntegerField(help_text="Coverage period in months")
     provider = models.CharField(max_length=255, help_text="e.g., Apple Inc. + TechMart Extended")
@@ -22,12 +53,39 @@ class Warranty(models.Model):
     purchase_date = models.DateField()
     expiry_date = models.DateField()
     
+    # Full-text document of the receipt item and customer, kept up to date by warranties.signals
+    search_vector = SearchVectorField(null=True, editable=False)
+    
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    
+    # receipt_item_id as last loaded from or saved to the database; None for a new warranty
+    _saved_receipt_item_id = None
 
     def __str__(self):
         return f"{self.receipt_item.product_name} - {self.status}"
     
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._saved_receipt_item_id = instance.__dict__.get('receipt_item_id')
+        return instance
+    
+    @property
+    def receipt_item_changed(self):
+        """Whether receipt_item differs from the saved one (always True for a new warranty)"""
+        return self.receipt_item_id != self._saved_receipt_item_id
+    
+    def save(self, *args, **kwargs):
+        """Copy customer, retailer and store from the receipt of a new or re-linked receipt_item"""
+        if self.receipt_item_changed:
+            receipt = self.receipt_item.receipt
+            self.customer_id = receipt.customer_id
+            self.retailer_id = receipt.retailer_id
+            self.store_id = receipt.store_id
+        super().save(*args, **kwargs)
+        self._saved_receipt_item_id = self.receipt_item_id
+    
     @property
     def status(self):
         """Automatically determine status based on expiry date"""
@@ -37,26 +95,11 @@ class Warranty(models.Model):
         else:
             return 'Expired'
     
-    @property
+    @cached_property
     def receipt(self):
         """Get receipt from receipt_item"""
         return self.receipt_item.receipt
     
-    @property
-    def customer(self):
-        """Get customer from receipt"""
-        return self.receipt_item.receipt.customer
-    
-    @property
-    def retailer(self):
-        """Get retailer from receipt"""
-        return self.receipt_item.receipt.retailer
-    
-    @property
-    def store(self):
-        """Get store from receipt"""
-        return self.receipt_item.receipt.store
-    
     @property
     def remaining_days(self):
         """Calculate remaining days of warranty"""
@@ -65,19 +108,34 @@ class Warranty(models.Model):
             return 0
         return (self.expiry_date - today).days
     
-    @property
+    @cached_property
     def coverage_value(self):
         """Get the purchase price from receipt item"""
         return self.receipt_item.price
     
-    @property
+    @cached_property
     def claims_count(self):
-        """Count of claims filed for this warranty"""
-        return self.claims.count()
+        """Count of claims filed for this warranty, taken from the claims_count_annotated annotation when present"""
+        claims_count = getattr(self, 'claims_count_annotated', None)
+        if claims_count is None:
+            claims_count = self.claims.count()
+        return claims_count
     
     class Meta:
         verbose_name_plural = 'Warranties'
         ordering = ['-created_at']
+        indexes = [
+            # Active warranty counts (expiry_date >= today)
+            models.Index(fields=['expiry_date'], name='warranty_expiry_idx'),
+            # Per-customer and per-retailer lists and expiry statistics
+            models.Index(fields=['customer', 'expiry_date'], name='warranty_customer_expiry_idx'),
+            models.Index(fields=['retailer', 'expiry_date'], name='warranty_retailer_expiry_idx'),
+            # Default ordering and the admin purchase_date drill-down
+            models.Index(fields=['-created_at'], name='warranty_created_idx'),
+            models.Index(fields=['purchase_date'], name='warranty_purchase_date_idx'),
+            # Full-text warranty search
+            GinIndex(fields=['search_vector'], name='warranty_search_vector_idx'),
+        ]
 
 
 class CustomerWarranty(models.Model):
@@ -113,6 +171,10 @@ class CustomerWarranty(models.Model):
         ordering = ['-created_at']
         verbose_name = 'Customer Warranty'
         verbose_name_plural = 'Customer Warranties'
+        indexes = [
+            # Admin expiry_date drill-down and expiry filters
+            models.Index(fields=['expiry_date'], name='customer_warranty_expiry_idx'),
+        ]
     
     def __str__(self):
         return f"{self.product_name} - {self.customer.email}"
@@ -125,16 +187,15 @@ class CustomerWarranty(models.Model):
     @property
     def days_remaining(self):
         """Calculate days remaining until expiry"""
-        if self.is_active:
-            delta = self.expiry_date - timezone.now().date()
-            return delta.days
-        return 0
+        return max((self.expiry_date - timezone.now().date()).days, 0)
     
     @property
     def status(self):
         """Get warranty status"""
-        if self.is_active:
-            if self.days_remaining <= 30:
-                return 'Expiring Soon'
-            return 'Active'
-        return 'Expired'
+        # Computed from a single date instead of going through is_active and days_remaining
+        days_left = (self.expiry_date - timezone.now().date()).days
+        if days_left < 0:
+            return 'Expired'
+        if days_left <= 30:
+            return 'Expiring Soon'
+        return 'Active'
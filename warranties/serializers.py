@@ -5,8 +5,30 @@ from receipts.models import ReceiptItem
 from accounts.serializers import UserSerializer
 from store.serializers import StoreSerializer
 from django.utils import timezone
+from django.utils.functional import cached_property
+from dateutil.relativedelta import relativedelta
 
-class WarrantyDetailSerializer(serializers.ModelSerializer):
+class WarrantyDateFieldsMixin:
+    """
+    status and remaining_days of a Warranty, evaluated against one date per serializer
+    (context['today'] when the view provides it) instead of timezone.now() per property
+    status is read from the WarrantyViewSet annotation when present
+    """
+    @cached_property
+    def today(self):
+        return self.context.get('today') or timezone.now().date()
+    
+    def get_status(self, obj):
+        status = getattr(obj, 'status_annotated', None)
+        if status is None:
+            status = 'Active' if self.today <= obj.expiry_date else 'Expired'
+        return status
+    
+    def get_remaining_days(self, obj):
+        return max((obj.expiry_date - self.today).days, 0)
+
+
+class WarrantyDetailSerializer(WarrantyDateFieldsMixin, serializers.ModelSerializer):
     # Receipt information with all items (including product details)
     receipt_info = serializers.SerializerMethodField()
     
@@ -17,7 +39,8 @@ class WarrantyDetailSerializer(serializers.ModelSerializer):
     store_info = StoreSerializer(source='store', read_only=True)
     
     # Calculated fields
-    remaining_days = serializers.ReadOnlyField()
+    status = serializers.SerializerMethodField()
+    remaining_days = serializers.SerializerMethodField()
     coverage_value = serializers.ReadOnlyField()
     claims_count = serializers.ReadOnlyField()
     
@@ -31,25 +54,31 @@ class WarrantyDetailSerializer(serializers.ModelSerializer):
             'receipt_info', 'customer_info', 'store_info',
             'created_at', 'updated_at'
         ]
+        read_only_fields = fields
     
     def get_receipt_info(self, obj):
         """Get receipt with all items (items include product details like color, imei, storage)"""
         receipt = obj.receipt
-        return {
-            'id': receipt.id,
-            'receipt_number': receipt.receipt_number,
-            'date': receipt.date,
-            'time': receipt.time,
-            'total': receipt.total,
-            'payment_method': receipt.payment_method,
-            'notes': receipt.notes,
-            'items': ReceiptItemSerializer(receipt.items.all(), many=True).data
-        }
+        # Warranties of the same receipt share one serialized receipt per request
+        receipt_cache = self.context.setdefault('_receipt_cache', {})
+        if receipt.id not in receipt_cache:
+            receipt_cache[receipt.id] = {
+                'id': receipt.id,
+                'receipt_number': receipt.receipt_number,
+                'date': receipt.date,
+                'time': receipt.time,
+                'total': receipt.total,
+                'payment_method': receipt.payment_method,
+                'notes': receipt.notes,
+                'items': ReceiptItemSerializer(receipt.items.all(), many=True).data
+            }
+        return receipt_cache[receipt.id]
 
 
-class WarrantyListSerializer(serializers.ModelSerializer):
+class WarrantyListSerializer(WarrantyDateFieldsMixin, serializers.ModelSerializer):
     product_name = serializers.CharField(source='receipt_item.product_name', read_only=True)
-    remaining_days = serializers.ReadOnlyField()
+    status = serializers.SerializerMethodField()
+    remaining_days = serializers.SerializerMethodField()
     coverage_value = serializers.ReadOnlyField()
     claims_count = serializers.ReadOnlyField()
     
@@ -59,6 +88,26 @@ class WarrantyListSerializer(serializers.ModelSerializer):
             'id', 'product_name', 'status', 'remaining_days', 
             'coverage_value', 'claims_count', 'expiry_date', 'created_at'
         ]
+        read_only_fields = fields
+
+
+class WarrantyListValuesSerializer(serializers.Serializer):
+    """
+    WarrantyListSerializer output built from the .values() rows of WarrantyViewSet.list
+    instead of Warranty instances; remaining_days is relative to context['today']
+    """
+    id = serializers.IntegerField(read_only=True)
+    product_name = serializers.CharField(read_only=True)
+    status = serializers.CharField(source='status_annotated', read_only=True)
+    remaining_days = serializers.SerializerMethodField()
+    coverage_value = serializers.ReadOnlyField()
+    claims_count = serializers.IntegerField(source='claims_count_annotated', read_only=True)
+    expiry_date = serializers.DateField(read_only=True)
+    created_at = serializers.DateTimeField(read_only=True)
+    
+    def get_remaining_days(self, obj):
+        """Days left until expiry, 0 once expired"""
+        return max((obj['expiry_date'] - self.context['today']).days, 0)
 
 
 class WarrantyCreateSerializer(serializers.ModelSerializer):
@@ -84,8 +133,6 @@ class WarrantyCreateSerializer(serializers.ModelSerializer):
         Automatically set purchase_date from receipt date
         and calculate expiry_date based on coverage_period_months
         """
-        from dateutil.relativedelta import relativedelta
-        
         receipt_item = validated_data['receipt_item']
         
         # Set purchase_date from receipt date
@@ -100,12 +147,40 @@ class WarrantyCreateSerializer(serializers.ModelSerializer):
 
 # ==================== CUSTOMER WARRANTY SERIALIZERS ====================
 
+# Warranty image upload limits
+MAX_WARRANTY_IMAGE_SIZE = 10 * 1024 * 1024  # 10MB in bytes
+ALLOWED_WARRANTY_IMAGE_TYPES = frozenset({
+    'image/jpeg', 'image/jpg', 'image/png', 'image/gif', 'image/webp'
+})
+
+
+def validate_warranty_image_file(value):
+    """
+    Size and type check for an uploaded warranty image
+    content_type here is the one Django's ImageField set from the Pillow-detected
+    format while verifying the file, not the header sent by the client
+    """
+    # Check file size (max 10MB)
+    if value.size > MAX_WARRANTY_IMAGE_SIZE:
+        raise serializers.ValidationError(
+            f"File size exceeds maximum limit of 10MB. Your file is {value.size / (1024*1024):.2f}MB"
+        )
+    
+    # Check file type (images only)
+    if value.content_type not in ALLOWED_WARRANTY_IMAGE_TYPES:
+        raise serializers.ValidationError(
+            f"Invalid file type. Allowed types: JPEG, PNG, GIF, WebP. Got: {value.content_type}"
+        )
+    
+    return value
+
+
 class CustomerWarrantySerializer(serializers.ModelSerializer):
     """Serializer for customer-uploaded warranties"""
     warranty_image_url = serializers.SerializerMethodField()
-    is_active = serializers.ReadOnlyField()
-    days_remaining = serializers.ReadOnlyField()
-    status = serializers.ReadOnlyField()
+    is_active = serializers.SerializerMethodField()
+    days_remaining = serializers.SerializerMethodField()
+    status = serializers.SerializerMethodField()
     
     class Meta:
         model = CustomerWarranty
@@ -116,6 +191,25 @@ class CustomerWarrantySerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ['created_at', 'updated_at']
     
+    @cached_property
+    def today(self):
+        """One date for is_active, days_remaining and status of every warranty serialized"""
+        return self.context.get('today') or timezone.now().date()
+    
+    def get_is_active(self, obj):
+        return obj.expiry_date >= self.today
+    
+    def get_days_remaining(self, obj):
+        return max((obj.expiry_date - self.today).days, 0)
+    
+    def get_status(self, obj):
+        days_left = (obj.expiry_date - self.today).days
+        if days_left < 0:
+            return 'Expired'
+        if days_left <= 30:
+            return 'Expiring Soon'
+        return 'Active'
+    
     def get_warranty_image_url(self, obj):
         """Get full URL for warranty image"""
         if obj.warranty_image:
@@ -140,28 +234,13 @@ class CustomerWarrantyCreateSerializer(serializers.ModelSerializer):
     
     def validate_expiry_date(self, value):
         """Validate expiry date is in the future"""
-        from django.utils import timezone
         if value < timezone.now().date():
             raise serializers.ValidationError("Expiry date must be in the future")
         return value
     
     def validate_warranty_image(self, value):
         """Validate warranty image file size and type"""
-        # Check file size (max 10MB)
-        max_size = 10 * 1024 * 1024  # 10MB in bytes
-        if value.size > max_size:
-            raise serializers.ValidationError(
-                f"File size exceeds maximum limit of 10MB. Your file is {value.size / (1024*1024):.2f}MB"
-            )
-        
-        # Check file type (images only)
-        allowed_types = ['image/jpeg', 'image/jpg', 'image/png', 'image/gif', 'image/webp']
-        if value.content_type not in allowed_types:
-            raise serializers.ValidationError(
-                f"Invalid file type. Allowed types: JPEG, PNG, GIF, WebP. Got: {value.content_type}"
-            )
-        
-        return value
+        return validate_warranty_image_file(value)
 
 
 class CustomerWarrantyUpdateSerializer(serializers.ModelSerializer):
@@ -173,7 +252,6 @@ class CustomerWarrantyUpdateSerializer(serializers.ModelSerializer):
     
     def validate_expiry_date(self, value):
         """Validate expiry date is in the future"""
-        from django.utils import timezone
         if value < timezone.now().date():
             raise serializers.ValidationError("Expiry date must be in the future")
         return value
@@ -182,27 +260,12 @@ class CustomerWarrantyUpdateSerializer(serializers.ModelSerializer):
         """Validate warranty image file size and type"""
         if not value:  # Allow null when not updating image
             return value
-        
-        # Check file size (max 10MB)
-        max_size = 10 * 1024 * 1024  # 10MB in bytes
-        if value.size > max_size:
-            raise serializers.ValidationError(
-                f"File size exceeds maximum limit of 10MB. Your file is {value.size / (1024*1024):.2f}MB"
-            )
-        
-        # Check file type (images only)
-        allowed_types = ['image/jpeg', 'image/jpg', 'image/png', 'image/gif', 'image/webp']
-        if value.content_type not in allowed_types:
-            raise serializers.ValidationError(
-                f"Invalid file type. Allowed types: JPEG, PNG, GIF, WebP. Got: {value.content_type}"
-            )
-        
-        return value
+        return validate_warranty_image_file(value)
 
 
 # ==================== CUSTOMER SELF-VIEW SERIALIZER ====================
 
-class CustomerWarrantyMeSerializer(serializers.ModelSerializer):
+class CustomerWarrantyMeSerializer(WarrantyDateFieldsMixin, serializers.ModelSerializer):
     """
     Serializer for customers to view their own warranties with receipt item details.
     Used in /api/warranties/me/ endpoint
@@ -221,9 +284,10 @@ class CustomerWarrantyMeSerializer(serializers.ModelSerializer):
     purchase_date_display = serializers.DateField(source='purchase_date', read_only=True)
     
     # Warranty status fields
+    status = serializers.SerializerMethodField()
     is_active = serializers.SerializerMethodField()
     is_expiring_soon = serializers.SerializerMethodField()
-    remaining_days = serializers.ReadOnlyField()
+    remaining_days = serializers.SerializerMethodField()
     coverage_value = serializers.ReadOnlyField()
     claims_count = serializers.ReadOnlyField()
     
@@ -246,12 +310,13 @@ class CustomerWarrantyMeSerializer(serializers.ModelSerializer):
             # Timestamps
             'created_at', 'updated_at'
         ]
+        read_only_fields = fields
     
     def get_is_active(self, obj):
         """Check if warranty is currently active (not expired)"""
-        return obj.expiry_date >= timezone.now().date()
+        return obj.expiry_date >= self.today
     
     def get_is_expiring_soon(self, obj):
         """Check if warranty is expiring within 30 days"""
-        days = obj.remaining_days
+        days = self.get_remaining_days(obj)
         return 0 < days <= 30
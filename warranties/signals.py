@@ -0,0 +1,111 @@
+from django.contrib.auth import get_user_model
+from django.db.models import OuterRef, Subquery
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.dispatch import receiver
+from receipts.models import Receipt, ReceiptItem
+from .models import Warranty
+from .utils import invalidate_warranty_statistics, refresh_warranty_search_vectors
+
+User = get_user_model()
+
+# Customer fields that are part of the warranty search document
+SEARCH_DOCUMENT_USER_FIELDS = ('email', 'first_name', 'last_name')
+
+
+@receiver([post_save, post_delete], sender=Warranty)
+def warranty_changed(sender, instance, **kwargs):
+    """Warranties feed the expiry counts of their customer's and retailer's list statistics"""
+    invalidate_warranty_statistics([instance.customer_id], [instance.retailer_id])
+
+
+def invalidate_party_statistics(warranties, receipt):
+    """
+    Drop the cached statistics of the current parties of the warranties and of the
+    receipt they are about to be synced to; returns False when there are no warranties
+    """
+    parties = set(warranties.values_list('customer_id', 'retailer_id'))
+    if not parties:
+        return False
+    parties.add((receipt.customer_id, receipt.retailer_id))
+    customer_ids, retailer_ids = zip(*parties)
+    invalidate_warranty_statistics(customer_ids, retailer_ids)
+    return True
+
+
+@receiver(post_save, sender=Warranty)
+def warranty_saved(sender, instance, **kwargs):
+    """Index the receipt item and customer of a new or re-linked warranty for search"""
+    # Coverage edits leave the search document as it is
+    if instance.receipt_item_changed:
+        refresh_warranty_search_vectors(Warranty.objects.filter(pk=instance.pk))
+
+
+def sync_receipt_parties(warranties, receipt=None):
+    """
+    Copy customer, retailer and store of receipt onto its warranties, or, without a
+    receipt, of each warranty's own receipt (after bulk updates of receipts or items).
+    update() sends no signals; store.signals recounts the claims of the old and new
+    store on a move
+    """
+    if receipt is not None:
+        warranties.update(
+            customer_id=receipt.customer_id,
+            retailer_id=receipt.retailer_id,
+            store_id=receipt.store_id
+        )
+        return
+    
+    def receipt_party(name):
+        return Subquery(
+            ReceiptItem.objects.filter(pk=OuterRef('receipt_item_id')).values(f'receipt__{name}')[:1]
+        )
+    
+    warranties.update(
+        customer_id=receipt_party('customer_id'),
+        retailer_id=receipt_party('retailer_id'),
+        store_id=receipt_party('store_id')
+    )
+
+
+@receiver(post_save, sender=ReceiptItem)
+def receipt_item_changed(sender, instance, created, **kwargs):
+    """Receipt item prices feed the total coverage of the warranty list statistics"""
+    if not created:
+        warranties = Warranty.objects.filter(receipt_item=instance)
+        if invalidate_party_statistics(warranties, instance.receipt):
+            # The item may have been moved to another receipt
+            sync_receipt_parties(warranties, instance.receipt)
+            refresh_warranty_search_vectors(warranties)
+
+
+@receiver(post_save, sender=Receipt)
+def receipt_changed(sender, instance, created, **kwargs):
+    """Receipt customer and retailer decide whose statistics a warranty counts towards"""
+    if not created:
+        warranties = Warranty.objects.filter(receipt_item__receipt=instance)
+        if invalidate_party_statistics(warranties, instance):
+            sync_receipt_parties(warranties, instance)
+            refresh_warranty_search_vectors(warranties)
+
+
+@receiver(pre_save, sender=User)
+def remember_customer_search_fields(sender, instance, update_fields=None, **kwargs):
+    """Keep the saved email and name of a customer, so customer_changed can tell whether they changed"""
+    # Saves that cannot touch those fields (e.g. logins, which only update last_login) are skipped
+    if instance._state.adding or instance.role != 'customer' or (
+        update_fields is not None and not set(update_fields) & set(SEARCH_DOCUMENT_USER_FIELDS)
+    ):
+        return
+    instance._saved_search_fields = User.objects.filter(pk=instance.pk).values_list(
+        *SEARCH_DOCUMENT_USER_FIELDS
+    ).first()
+
+
+@receiver(post_save, sender=User)
+def customer_changed(sender, instance, created, **kwargs):
+    """Customer email and name are part of the warranty search document"""
+    saved_fields = instance.__dict__.pop('_saved_search_fields', None)
+    if created or saved_fields is None:
+        return
+    if saved_fields != tuple(getattr(instance, name) for name in SEARCH_DOCUMENT_USER_FIELDS):
+        refresh_warranty_search_vectors(Warranty.objects.filter(customer=instance))
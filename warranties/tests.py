@@ -1,3 +1,300 @@
-from django.test import TestCase
+from datetime import date
+from importlib import import_module
 
-# Create your tests here.
+from django.apps import apps
+from django.contrib import admin
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, RequestFactory, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+from claims.models import Claim
+from receipts.models import Receipt, ReceiptItem
+from store.models import Store
+from .models import Warranty
+from .signals import sync_receipt_parties
+from .utils import warranty_statistics_cache_key
+
+User = get_user_model()
+
+# Cached statistics are tested against a per-process cache
+LOCMEM_CACHES = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+
+
+def create_user(email, role, **kwargs):
+    return User.objects.create_user(email, email.split('@')[0].title(), 'pass', role=role, **kwargs)
+
+
+def create_store(name='Store'):
+    return Store.objects.create(name=name, phone_number='1', email='store@example.com', address='Street 1')
+
+
+def create_warranty(store, retailer, customer, product_name='Phone', expiry_date=date(2027, 1, 10)):
+    receipt = Receipt.objects.create(store=store, retailer=retailer, customer=customer, total=100, date=date(2026, 1, 10))
+    item = ReceiptItem.objects.create(receipt=receipt, product_name=product_name, price=100)
+    return Warranty.objects.create(
+        receipt_item=item, coverage_period_months=12, provider='Maker', coverage_terms='Hardware',
+        purchase_date=date(2026, 1, 10), expiry_date=expiry_date
+    )
+
+
+class WarrantyAdminSearchTests(TestCase):
+    """Customer email and username are matched by prefix in the warranty admin"""
+
+    @classmethod
+    def setUpTestData(cls):
+        retailer = create_user('retailer@example.com', 'retailer')
+        customer = create_user('alice@example.com', 'customer', username='alice')
+        cls.warranty = create_warranty(create_store(), retailer, customer)
+
+    def search(self, term):
+        model_admin = admin.site._registry[Warranty]
+        request = RequestFactory().get('/admin/warranties/warranty/', {'q': term})
+        queryset, _ = model_admin.get_search_results(request, Warranty.objects.all(), term)
+        return list(queryset)
+
+    def test_email_and_username_prefix(self):
+        self.assertEqual(self.search('ALICE@'), [self.warranty])
+        self.assertEqual(self.search('ali'), [self.warranty])
+
+    def test_no_substring_match(self):
+        self.assertEqual(self.search('lice'), [])
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class WarrantyStatisticsCacheTests(TestCase):
+    """Cached list statistics are dropped only for the parties whose warranties changed"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.store = create_store()
+        cls.retailer = create_user('retailer@example.com', 'retailer')
+        cls.other_retailer = create_user('other@example.com', 'retailer')
+        cls.customer = create_user('customer@example.com', 'customer')
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+
+    def active_warranties(self, user):
+        self.client.force_authenticate(user)
+        response = self.client.get('/api/warranties/', {'include_stats': '1'})
+        return response.data['statistics']['active_warranties']
+
+    def test_own_warranty_drops_cached_statistics(self):
+        self.assertEqual(self.active_warranties(self.retailer), 0)
+        with self.captureOnCommitCallbacks(execute=True):
+            create_warranty(self.store, self.retailer, self.customer)
+        self.assertEqual(self.active_warranties(self.retailer), 1)
+
+    def test_other_retailers_warranty_keeps_cached_statistics(self):
+        today = timezone.now().date()
+        self.active_warranties(self.retailer)
+        cache_key = warranty_statistics_cache_key(self.retailer, today)
+        with self.captureOnCommitCallbacks(execute=True):
+            create_warranty(self.store, self.other_retailer, self.customer)
+        # The other retailer's write leaves this retailer's cached block in place
+        self.assertEqual(warranty_statistics_cache_key(self.retailer, today), cache_key)
+        self.assertIsNotNone(cache.get(cache_key))
+        self.assertEqual(self.active_warranties(self.other_retailer), 1)
+
+    def test_receipt_move_drops_old_and_new_retailer_statistics(self):
+        warranty = create_warranty(self.store, self.retailer, self.customer)
+        self.assertEqual(self.active_warranties(self.retailer), 1)
+        self.assertEqual(self.active_warranties(self.other_retailer), 0)
+        with self.captureOnCommitCallbacks(execute=True):
+            receipt = warranty.receipt_item.receipt
+            receipt.retailer = self.other_retailer
+            receipt.save()
+        self.assertEqual(self.active_warranties(self.retailer), 0)
+        self.assertEqual(self.active_warranties(self.other_retailer), 1)
+
+
+class SearchVectorRefreshTests(TestCase):
+    """The warranty search document is rebuilt only when its inputs change"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.retailer = create_user('retailer@example.com', 'retailer')
+        cls.customer = create_user('customer@example.com', 'customer')
+        cls.store = create_store()
+
+    def setUp(self):
+        self.warranty = create_warranty(self.store, self.retailer, self.customer)
+        # Cleared so a rebuild is visible
+        Warranty.objects.filter(pk=self.warranty.pk).update(search_vector=None)
+
+    def search_vector(self):
+        return Warranty.objects.values_list('search_vector', flat=True).get(pk=self.warranty.pk)
+
+    def test_new_warranty_is_indexed(self):
+        warranty = create_warranty(self.store, self.retailer, self.customer, product_name='Tablet')
+        self.assertIn('tablet', Warranty.objects.values_list('search_vector', flat=True).get(pk=warranty.pk))
+
+    def test_coverage_edit_keeps_search_vector(self):
+        warranty = Warranty.objects.get(pk=self.warranty.pk)
+        warranty.provider = 'Other'
+        warranty.save()
+        self.assertIsNone(self.search_vector())
+
+    def test_relinked_warranty_is_indexed(self):
+        warranty = Warranty.objects.get(pk=self.warranty.pk)
+        warranty.receipt_item = ReceiptItem.objects.create(
+            receipt=warranty.receipt_item.receipt, product_name='Tablet', price=100
+        )
+        warranty.save()
+        self.assertIn('tablet', self.search_vector())
+
+    def test_password_change_keeps_search_vector(self):
+        customer = User.objects.get(pk=self.customer.pk)
+        customer.set_password('other-pass')
+        customer.save()
+        self.assertIsNone(self.search_vector())
+
+    def test_email_change_reindexes(self):
+        customer = User.objects.get(pk=self.customer.pk)
+        customer.email = 'renamed@example.com'
+        customer.save()
+        self.assertIn('renamed@example.com', self.search_vector())
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class ReceiptPartiesTests(TestCase):
+    """Warranty copies of the receipt parties follow the receipt, and so do permissions"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.store = create_store()
+        cls.other_store = create_store('Other')
+        cls.retailer = create_user('retailer@example.com', 'retailer')
+        cls.other_retailer = create_user('other-retailer@example.com', 'retailer')
+        cls.customer = create_user('customer@example.com', 'customer')
+        cls.other_customer = create_user('other-customer@example.com', 'customer')
+
+    def setUp(self):
+        self.warranty = create_warranty(self.store, self.retailer, self.customer)
+        self.claim = Claim.objects.create(
+            warranty=self.warranty, issue_summary='Broken', detailed_description='Screen broke'
+        )
+        self.receipt = self.warranty.receipt_item.receipt
+        self.client = APIClient()
+
+    def parties(self):
+        return Warranty.objects.values_list('customer_id', 'retailer_id', 'store_id').get(pk=self.warranty.pk)
+
+    def can_see(self, user):
+        """Whether the user can open both the warranty and its claim"""
+        self.client.force_authenticate(user)
+        warranty_status = self.client.get(f'/api/warranties/{self.warranty.pk}/').status_code
+        claim_status = self.client.get(f'/api/claims/{self.claim.pk}/').status_code
+        self.assertEqual(warranty_status, claim_status)
+        return warranty_status == 200
+
+    def test_receipt_moved_to_another_customer(self):
+        self.receipt.customer = self.other_customer
+        self.receipt.save()
+        self.assertEqual(self.parties(), (self.other_customer.pk, self.retailer.pk, self.store.pk))
+        self.assertFalse(self.can_see(self.customer))
+        self.assertTrue(self.can_see(self.other_customer))
+
+    def test_receipt_moved_to_another_retailer(self):
+        self.receipt.retailer = self.other_retailer
+        self.receipt.save()
+        self.assertEqual(self.parties(), (self.customer.pk, self.other_retailer.pk, self.store.pk))
+        self.assertFalse(self.can_see(self.retailer))
+        self.assertTrue(self.can_see(self.other_retailer))
+
+    def test_receipt_moved_to_another_store(self):
+        self.receipt.store = self.other_store
+        self.receipt.save()
+        self.assertEqual(self.parties(), (self.customer.pk, self.retailer.pk, self.other_store.pk))
+
+    def test_item_moved_to_another_receipt(self):
+        other_receipt = Receipt.objects.create(
+            store=self.other_store, retailer=self.other_retailer, customer=self.other_customer,
+            total=100, date=date(2026, 2, 1)
+        )
+        item = self.warranty.receipt_item
+        item.receipt = other_receipt
+        item.save()
+        self.assertEqual(self.parties(), (self.other_customer.pk, self.other_retailer.pk, self.other_store.pk))
+        self.assertFalse(self.can_see(self.customer))
+        self.assertTrue(self.can_see(self.other_customer))
+
+    def test_bulk_update_followed_by_sync(self):
+        Receipt.objects.filter(pk=self.receipt.pk).update(customer=self.other_customer)
+        # update() sends no signals; the warranty keeps the old customer until it is synced
+        self.assertEqual(self.parties()[0], self.customer.pk)
+        sync_receipt_parties(Warranty.objects.filter(receipt_item__receipt=self.receipt))
+        self.assertEqual(self.parties()[0], self.other_customer.pk)
+        self.assertTrue(self.can_see(self.other_customer))
+
+    def test_warranty_save_keeps_parties_without_relinking(self):
+        warranty = Warranty.objects.get(pk=self.warranty.pk)
+        warranty.provider = 'Other'
+        # No receipt is loaded when receipt_item is unchanged
+        with self.assertNumQueries(1):
+            warranty.save(update_fields=['provider', 'updated_at'])
+
+    def test_backfill_migration(self):
+        other_store = create_store('Other')
+        Warranty.objects.filter(pk=self.warranty.pk).update(
+            customer=self.other_customer, retailer=self.other_retailer, store=other_store
+        )
+        migration = import_module('warranties.migrations.0011_warranty_receipt_parties')
+        migration.backfill_receipt_parties(apps, None)
+        self.assertEqual(self.parties(), (self.customer.pk, self.retailer.pk, self.store.pk))
+
+
+class WarrantyListPaginationTests(TestCase):
+    """Warranty lists are cursor-paginated, 20 per page, with opt-in statistics"""
+
+    @classmethod
+    def setUpTestData(cls):
+        store = create_store()
+        cls.retailer = create_user('retailer@example.com', 'retailer')
+        cls.customer = create_user('customer@example.com', 'customer')
+        cls.warranties = [create_warranty(store, cls.retailer, cls.customer) for _ in range(21)]
+
+    def setUp(self):
+        self.client = APIClient()
+
+    def test_list_pages(self):
+        self.client.force_authenticate(self.retailer)
+        first_page = self.client.get('/api/warranties/').data
+        self.assertEqual(set(first_page), {'next', 'previous', 'results', 'statistics'})
+        self.assertIsNone(first_page['statistics'])
+        self.assertEqual(
+            [warranty['id'] for warranty in first_page['results']],
+            [warranty.id for warranty in reversed(self.warranties[1:])]
+        )
+
+        second_page = self.client.get(first_page['next']).data
+        self.assertEqual([warranty['id'] for warranty in second_page['results']], [self.warranties[0].id])
+        self.assertIsNone(second_page['next'])
+
+    @override_settings(CACHES=LOCMEM_CACHES)
+    def test_list_statistics_on_request(self):
+        cache.clear()
+        self.client.force_authenticate(self.retailer)
+        response = self.client.get('/api/warranties/', {'include_stats': '1'})
+        self.assertEqual(response.data['statistics']['active_warranties'], 21)
+        self.assertEqual(len(response.data['results']), 20)
+
+    def test_me_pages(self):
+        self.client.force_authenticate(self.customer)
+        first_page = self.client.get('/api/warranties/me/').data
+        self.assertEqual(list(first_page), ['count', 'next', 'previous', 'statistics', 'results'])
+        self.assertIsNone(first_page['count'])
+        self.assertIsNone(first_page['statistics'])
+        self.assertEqual(len(first_page['results']), 20)
+
+        second_page = self.client.get(first_page['next']).data
+        self.assertEqual([warranty['id'] for warranty in second_page['results']], [self.warranties[0].id])
+
+    def test_me_count_on_request(self):
+        self.client.force_authenticate(self.customer)
+        response = self.client.get('/api/warranties/me/', {'include_stats': '1'})
+        self.assertEqual(response.data['count'], 21)
+        self.assertEqual(response.data['statistics']['active'], 21)
+        self.assertEqual(len(response.data['results']), 20)
@@ -0,0 +1,85 @@
+import re
+import time
+
+from django.contrib.postgres.search import SearchQuery, SearchVector, SearchVectorField
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import OuterRef, Subquery
+from receipts.models import ReceiptItem
+
+# Role-scoped list statistics are cached briefly; customers' own warranties change rarely
+WARRANTY_STATS_CACHE_TIMEOUT = 60  # seconds
+CUSTOMER_WARRANTY_STATS_CACHE_TIMEOUT = 300  # seconds
+
+# Statistics scope of admins, who see every warranty
+ALL_WARRANTIES_SCOPE = 'all'
+
+
+def warranty_statistics_scope(user):
+    """Which warranties the user's statistics cover: all of them, or the customer's or retailer's own"""
+    return ALL_WARRANTIES_SCOPE if user.role == 'admin' else f'{user.role}:{user.id}'
+
+
+def warranty_statistics_version_key(scope):
+    """Cache key of the version of the statistics of a scope; dropped when its warranties change"""
+    return f'warranty_stats_version:{scope}'
+
+
+def warranty_statistics_cache_key(user, today):
+    """Cache key of the WarrantyViewSet.list statistics visible to the user on the given day"""
+    scope = warranty_statistics_scope(user)
+    # A missing version is seeded with the current time, so it never reuses an old one
+    version = cache.get_or_set(warranty_statistics_version_key(scope), time.time_ns, None)
+    return f'warranty_stats:{scope}:{version}:{today.isoformat()}'
+
+
+def warranty_statistics_cache_timeout(user):
+    if user.role == 'customer':
+        return CUSTOMER_WARRANTY_STATS_CACHE_TIMEOUT
+    return WARRANTY_STATS_CACHE_TIMEOUT
+
+
+def invalidate_warranty_statistics(customer_ids=(), retailer_ids=()):
+    """
+    Make the cached statistics of the given customers and retailers, and the admins'
+    statistics of all warranties, stale once the transaction commits. Dropping a
+    scope's version makes the next request seed a fresh one.
+    """
+    scopes = [ALL_WARRANTIES_SCOPE]
+    scopes += [f'customer:{customer_id}' for customer_id in set(customer_ids) if customer_id is not None]
+    scopes += [f'retailer:{retailer_id}' for retailer_id in set(retailer_ids) if retailer_id is not None]
+    keys = [warranty_statistics_version_key(scope) for scope in scopes]
+    transaction.on_commit(lambda: cache.delete_many(keys))
+
+
+def warranty_search_vector():
+    """
+    Search document of a warranty: product name, serial number and IMEI of its receipt
+    item and the customer's email and name; a subquery, so it can be used in update()
+    """
+    document = ReceiptItem.objects.filter(pk=OuterRef('receipt_item_id')).annotate(
+        document=(
+            SearchVector('product_name', weight='A', config='simple')
+            + SearchVector('serial_number', 'imei', weight='B', config='simple')
+            + SearchVector(
+                'receipt__customer__email', 'receipt__customer__first_name', 'receipt__customer__last_name',
+                weight='C', config='simple'
+            )
+        )
+    ).values('document')
+    return Subquery(document, output_field=SearchVectorField())
+
+
+def refresh_warranty_search_vectors(queryset):
+    """Rebuild the search_vector of the given warranties in one UPDATE"""
+    queryset.update(search_vector=warranty_search_vector())
+
+
+def warranty_search_query(search):
+    """
+    Prefix query matching every word of the search text, or None when it has no words
+    """
+    terms = re.findall(r'\w+', search)
+    if not terms:
+        return None
+    return SearchQuery(' & '.join(f'{term}:*' for term in terms), search_type='raw', config='simple')
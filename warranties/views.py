@@ -1,17 +1,97 @@
 from rest_framework import viewsets, permissions, status
 from rest_framework.decorators import action
+from rest_framework.pagination import CursorPagination
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from .models import Warranty
 from .serializers import (
-    WarrantyListSerializer, WarrantyDetailSerializer, 
+    WarrantyListValuesSerializer, WarrantyDetailSerializer, 
     WarrantyCreateSerializer, CustomerWarrantyMeSerializer
 )
-from django.db.models import Q, Sum, Count, F
+from store.serializers import admins_prefetch
+from .utils import (
+    warranty_statistics_cache_key, warranty_statistics_cache_timeout, warranty_search_query
+)
+from django.db.models import Q, Sum, Count, F, Case, When, Value, CharField
+from django.conf import settings
+from django.core.cache import cache
 from django.utils import timezone
+from django.utils.functional import cached_property
 from datetime import timedelta
-import csv
-from django.http import HttpResponse
+from receipts.utils import csv_response
+
+
+def warranty_annotations(today):
+    """
+    Per-warranty values read by the warranty serializers, computed by the database
+    instead of the status and claims_count model properties
+    """
+    return {
+        'claims_count_annotated': Count('claims'),
+        'status_annotated': Case(
+            When(expiry_date__gte=today, then=Value('Active')),
+            default=Value('Expired'),
+            output_field=CharField(),
+        ),
+    }
+
+
+def expiry_bucket_counts(today):
+    """
+    Conditional counts of active, expiring-soon (within 30 days) and expired warranties,
+    for a single aggregate() query
+    """
+    soon_date = today + timedelta(days=30)
+    return {
+        'active': Count('pk', filter=Q(expiry_date__gte=today)),
+        'expiring_soon': Count('pk', filter=Q(expiry_date__gte=today, expiry_date__lte=soon_date)),
+        'expired': Count('pk', filter=Q(expiry_date__lt=today)),
+    }
+
+
+# Columns of the warranty list rows read by WarrantyListValuesSerializer
+WARRANTY_LIST_FIELDS = ('id', 'expiry_date', 'created_at', 'status_annotated', 'claims_count_annotated')
+WARRANTY_LIST_EXPRESSIONS = {
+    'product_name': F('receipt_item__product_name'),
+    'coverage_value': F('receipt_item__price'),
+}
+
+
+# Columns read by CustomerWarrantyMeSerializer; the rest of the receipt and store rows is never rendered
+WARRANTY_ME_ONLY_FIELDS = (
+    'id', 'coverage_period_months', 'provider', 'coverage_terms',
+    'purchase_date', 'expiry_date', 'created_at', 'updated_at',
+    'receipt_item__product_name', 'receipt_item__model', 'receipt_item__serial_number',
+    'receipt_item__price', 'receipt_item__quantity', 'receipt_item__color', 'receipt_item__imei',
+    'receipt_item__storage', 'receipt_item__warranty_coverage', 'receipt_item__warranty_expiry',
+    'receipt_item__receipt__receipt_number',
+    'store__name', 'store__phone_number', 'store__address', 'store__is_verified',
+)
+
+
+# Object permission per role, comparing the warranty's foreign key ids so no User or Receipt is loaded
+WARRANTY_OBJECT_PERMISSIONS = {
+    # Admins can do anything
+    'admin': lambda user, warranty: True,
+    # Retailers can manage warranties for their receipts
+    'retailer': lambda user, warranty: warranty.retailer_id == user.id,
+    # Customers can view their own warranties
+    'customer': lambda user, warranty: warranty.customer_id == user.id,
+}
+
+
+# All-digit searches at least this long are treated as a serial number or IMEI
+DEVICE_ID_MIN_LENGTH = 8
+
+
+# Export CSV columns, in order; Remaining Days is inserted after expiry_date
+WARRANTY_EXPORT_FIELDS = (
+    'id', 'receipt_item__product_name', 'receipt_item__model',
+    'receipt_item__serial_number', 'receipt_item__imei',
+    'customer__email', 'store__name',
+    'status_annotated', 'purchase_date', 'expiry_date',
+    'receipt_item__price', 'provider', 'coverage_terms', 'claims_count_annotated',
+)
 
 
 class IsAuthenticatedUser(permissions.BasePermission):
@@ -22,65 +102,87 @@ class IsAuthenticatedUser(permissions.BasePermission):
         return request.user.is_authenticated
     
     def has_object_permission(self, request, view, obj):
-        # Admins can do anything
-        if request.user.role == 'admin':
-            return True
-        # Retailers can manage warranties for their receipts
-        if request.user.role == 'retailer':
-            return obj.retailer == request.user
-        # Customers can view their own warranties
-        if request.user.role == 'customer':
-            return obj.customer == request.user
-        return False
+        check = WARRANTY_OBJECT_PERMISSIONS.get(request.user.role)
+        return check is not None and check(request.user, obj)
+
+
+class WarrantyCursorPagination(CursorPagination):
+    """
+    Cursor pagination for warranty lists, so deep pages seek on the created_at index instead of OFFSET
+    """
+    page_size = 20
+    ordering = '-created_at'
 
 
 class WarrantyViewSet(viewsets.ModelViewSet):
     permission_classes = [IsAuthenticatedUser]
+    pagination_class = WarrantyCursorPagination
     # Only allow GET and POST - no PUT/PATCH/DELETE (warranties are immutable)
     http_method_names = ['get', 'post', 'head', 'options']
     
+    @cached_property
+    def today(self):
+        """The date every filter, statistic and serializer of this request is evaluated against"""
+        return timezone.now().date()
+    
     def get_queryset(self):
         user = self.request.user
+        today = self.today
         
-        # Base queryset with related data
+        # Base queryset with related data; claim counts and status come from annotations
         queryset = Warranty.objects.select_related(
             'receipt_item', 
             'receipt_item__receipt',
-            'receipt_item__receipt__store',
-            'receipt_item__receipt__customer',
-            'receipt_item__receipt__retailer'
-        ).prefetch_related('claims')
+            'customer',
+            'store'
+        ).annotate(**warranty_annotations(today))
+        
+        if self.action == 'retrieve':
+            # Receipt items and store admins nested by WarrantyDetailSerializer
+            queryset = queryset.prefetch_related(
+                'receipt_item__receipt__items',
+                admins_prefetch('store__admins'),
+            )
         
         # Filter based on user role
         if user.role == 'admin':
             pass  # Admins see all
         elif user.role == 'retailer':
-            queryset = queryset.filter(receipt_item__receipt__retailer=user)
+            queryset = queryset.filter(retailer=user)
         elif user.role == 'customer':
-            queryset = queryset.filter(receipt_item__receipt__customer=user)
+            queryset = queryset.filter(customer=user)
         else:
             return Warranty.objects.none()
         
         # Apply search filter
         search = self.request.query_params.get('search', None)
-        if search:
+        if search and search.isdigit() and len(search) >= DEVICE_ID_MIN_LENGTH:
+            # A pasted serial number or IMEI: exact match on the indexed columns
             queryset = queryset.filter(
-                Q(receipt_item__product_name__icontains=search) |
-                Q(receipt_item__serial_number__icontains=search) |
-                Q(receipt_item__imei__icontains=search) |
-                Q(receipt_item__receipt__customer__email__icontains=search) |
-                Q(receipt_item__receipt__customer__first_name__icontains=search) |
-                Q(receipt_item__receipt__customer__last_name__icontains=search)
+                Q(receipt_item__serial_number=search) | Q(receipt_item__imei=search)
             )
+        elif search:
+            search_query = warranty_search_query(search) if settings.WARRANTY_FULL_TEXT_SEARCH else None
+            if search_query is not None:
+                # Prefix match against the GIN-indexed search_vector
+                queryset = queryset.filter(search_vector=search_query)
+            else:
+                queryset = queryset.filter(
+                    Q(receipt_item__product_name__icontains=search) |
+                    Q(receipt_item__serial_number__icontains=search) |
+                    Q(receipt_item__imei__icontains=search) |
+                    Q(customer__email__icontains=search) |
+                    Q(customer__first_name__icontains=search) |
+                    Q(customer__last_name__icontains=search)
+                )
         
         # Apply status filter
         status_filter = self.request.query_params.get('status', None)
         if status_filter and status_filter != 'all':
-            queryset = queryset.filter(status=status_filter)
+            queryset = queryset.filter(status_annotated=status_filter)
         
         # Apply coverage filter (based on expiry)
         coverage_filter = self.request.query_params.get('coverage', None)
-        today = timezone.now().date()
         
         if coverage_filter == 'active':
             queryset = queryset.filter(expiry_date__gte=today)
@@ -101,66 +203,68 @@ class WarrantyViewSet(viewsets.ModelViewSet):
             return WarrantyCreateSerializer
         elif self.action == 'retrieve':
             return WarrantyDetailSerializer
-        return WarrantyListSerializer
+        return WarrantyListValuesSerializer
+    
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context['today'] = self.today
+        return context
     
     def list(self, request, *args, **kwargs):
         """
-        List warranties with statistics included
+        List warranties, with statistics when requested via ?include_stats=1
+        Rows are fetched as .values() dicts, without building Warranty instances
         """
-        queryset = self.filter_queryset(self.get_queryset())
+        queryset = self.filter_queryset(self.get_queryset()).values(
+            *WARRANTY_LIST_FIELDS, **WARRANTY_LIST_EXPRESSIONS
+        )
         
         # Calculate statistics for all warranties (without filters except role-based)
         user = request.user
         if user.role == 'admin':
             stats_queryset = Warranty.objects.all()
         elif user.role == 'retailer':
-            stats_queryset = Warranty.objects.filter(receipt_item__receipt__retailer=user)
+            stats_queryset = Warranty.objects.filter(retailer=user)
         elif user.role == 'customer':
-            stats_queryset = Warranty.objects.filter(receipt_item__receipt__customer=user)
+            stats_queryset = Warranty.objects.filter(customer=user)
         else:
             stats_queryset = Warranty.objects.none()
         
-        today = timezone.now().date()
-        soon_date = today + timedelta(days=30)
-        
-        # Active warranties (not expired)
-        active_count = stats_queryset.filter(expiry_date__gte=today).count()
-        
-        # Expiring soon (within 30 days, not yet expired)
-        expiring_soon_count = stats_queryset.filter(
-            expiry_date__gte=today,
-            expiry_date__lte=soon_date
-        ).count()
+        today = self.today
         
-        # Expired
-        expired_count = stats_queryset.filter(expiry_date__lt=today).count()
+        def compute_statistics():
+            # Expiry buckets and total coverage value in one query
+            stats = stats_queryset.aggregate(
+                **expiry_bucket_counts(today),
+                total_coverage=Sum('receipt_item__price')
+            )
+            return {
+                'active_warranties': stats['active'],
+                'expiring_soon': stats['expiring_soon'],
+                'expired': stats['expired'],
+                'total_coverage': float(stats['total_coverage'] or 0)
+            }
         
-        # Total coverage value (sum of all coverage values)
-        total_coverage = stats_queryset.aggregate(
-            total=Sum('receipt_item__price')
-        )['total'] or 0
+        # Statistics are opt-in, so paging through results runs no aggregate
+        statistics = None
+        if request.query_params.get('include_stats') == '1':
+            statistics = cache.get_or_set(
+                warranty_statistics_cache_key(user, today),
+                compute_statistics,
+                warranty_statistics_cache_timeout(user)
+            )
         
         # Paginate warranties
         page = self.paginate_queryset(queryset)
         if page is not None:
             serializer = self.get_serializer(page, many=True)
             response = self.get_paginated_response(serializer.data)
-            response.data['statistics'] = {
-                'active_warranties': active_count,
-                'expiring_soon': expiring_soon_count,
-                'expired': expired_count,
-                'total_coverage': float(total_coverage)
-            }
+            response.data['statistics'] = statistics
             return response
         
         serializer = self.get_serializer(queryset, many=True)
         return Response({
-            'statistics': {
-                'active_warranties': active_count,
-                'expiring_soon': expiring_soon_count,
-                'expired': expired_count,
-                'total_coverage': float(total_coverage)
-            },
+            'statistics': statistics,
             'results': serializer.data
         })
     
@@ -168,47 +272,32 @@ class WarrantyViewSet(viewsets.ModelViewSet):
     def export(self, request):
         """
         Export all warranties to CSV
+        Rows are streamed so large exports are never buffered in memory
         """
-        queryset = self.get_queryset()
-        
-        # Create CSV response
-        response = HttpResponse(content_type='text/csv')
-        response['Content-Disposition'] = f'attachment; filename="warranties_{timezone.now().strftime("%Y%m%d_%H%M%S")}.csv"'
-        
-        writer = csv.writer(response)
-        writer.writerow([
-            'Warranty ID', 'Product Name', 'Model', 'Serial Number', 'IMEI',
-            'Customer', 'Store', 'Status', 'Purchase Date', 'Expiry Date',
-            'Remaining Days', 'Coverage Value', 'Provider', 'Coverage Terms', 'Claims Count'
-        ])
+        today = self.today
+        values = self.get_queryset().values_list(*WARRANTY_EXPORT_FIELDS)
         
-        for warranty in queryset:
-            writer.writerow([
-                warranty.id,
-                warranty.receipt_item.product_name,
-                warranty.receipt_item.model or '',
-                warranty.receipt_item.serial_number or '',
-                warranty.receipt_item.imei or '',
-                warranty.customer.email,
-                warranty.store.name,
-                warranty.status,
-                warranty.purchase_date,
-                warranty.expiry_date,
-                warranty.remaining_days,
-                warranty.coverage_value,
-                warranty.provider,
-                warranty.coverage_terms,
-                warranty.claims_count
-            ])
+        def rows():
+            yield [
+                'Warranty ID', 'Product Name', 'Model', 'Serial Number', 'IMEI',
+                'Customer', 'Store', 'Status', 'Purchase Date', 'Expiry Date',
+                'Remaining Days', 'Coverage Value', 'Provider', 'Coverage Terms', 'Claims Count'
+            ]
+            # Tuples straight from the cursor; only Remaining Days is added in Python
+            for row in values.iterator(chunk_size=2000):
+                expiry_date = row[9]
+                yield (*row[:10], max((expiry_date - today).days, 0), *row[10:])
         
-        return response
+        filename = f'warranties_{timezone.now().strftime("%Y%m%d_%H%M%S")}.csv'
+        return csv_response(request, rows(), filename)
 
 
 class CustomerWarrantyMeView(APIView):
     """
     GET /api/warranties/me/
-    Returns all warranties for the authenticated customer with receipt item details.
-    Only accessible to customers.
+    Returns the authenticated customer's warranties with receipt item details,
+    cursor-paginated newest first. count and statistics are only computed
+    with ?include_stats=1. Only accessible to customers.
     """
     permission_classes = [permissions.IsAuthenticated]
     
@@ -220,19 +309,21 @@ class CustomerWarrantyMeView(APIView):
                 status=status.HTTP_403_FORBIDDEN
             )
         
+        today = timezone.now().date()
+        serializer_context = {'request': request, 'today': today}
+        
         # If pk is provided, return detail view
         if pk:
             try:
                 warranty = Warranty.objects.select_related(
                     'receipt_item',
                     'receipt_item__receipt',
-                    'receipt_item__receipt__store',
-                    'receipt_item__receipt__retailer'
-                ).prefetch_related('claims').get(
+                    'store'
+                ).only(*WARRANTY_ME_ONLY_FIELDS).annotate(**warranty_annotations(today)).get(
                     pk=pk,
-                    receipt_item__receipt__customer=request.user
+                    customer=request.user
                 )
-                serializer = CustomerWarrantyMeSerializer(warranty, context={'request': request})
+                serializer = CustomerWarrantyMeSerializer(warranty, context=serializer_context)
                 return Response(serializer.data)
             except Warranty.DoesNotExist:
                 return Response(
@@ -242,18 +333,16 @@ class CustomerWarrantyMeView(APIView):
         
         # List view - Get all warranties for this customer with optimized query
         warranties = Warranty.objects.filter(
-            receipt_item__receipt__customer=request.user
+            customer=request.user
         ).select_related(
             'receipt_item',
             'receipt_item__receipt',
-            'receipt_item__receipt__store',
-            'receipt_item__receipt__retailer'
-        ).prefetch_related('claims').order_by('-created_at')
+            'store'
+        ).only(*WARRANTY_ME_ONLY_FIELDS).order_by('-created_at')
         
         # Apply optional filters
         status_filter = request.query_params.get('status', None)
         if status_filter:
-            today = timezone.now().date()
             if status_filter == 'active':
                 warranties = warranties.filter(expiry_date__gte=today)
             elif status_filter == 'expired':
@@ -274,28 +363,29 @@ class CustomerWarrantyMeView(APIView):
                 Q(receipt_item__serial_number__icontains=search)
             )
         
-        # Serialize and return
-        serializer = CustomerWarrantyMeSerializer(warranties, many=True, context={'request': request})
+        # Serialize one cursor page; claim counts and status come from annotations
+        paginator = WarrantyCursorPagination()
+        page = paginator.paginate_queryset(
+            warranties.annotate(**warranty_annotations(today)), request, view=self
+        )
+        serializer = CustomerWarrantyMeSerializer(page, many=True, context=serializer_context)
         
-        # Calculate statistics
-        today = timezone.now().date()
-        soon_date = today + timedelta(days=30)
-        
-        total_count = warranties.count()
-        active_count = warranties.filter(expiry_date__gte=today).count()
-        expired_count = warranties.filter(expiry_date__lt=today).count()
-        expiring_soon_count = warranties.filter(
-            expiry_date__gte=today,
-            expiry_date__lte=soon_date
-        ).count()
+        # Calculate statistics in one query (on the unannotated queryset, so without GROUP BY)
+        count = statistics = None
+        if request.query_params.get('include_stats') == '1':
+            stats = warranties.aggregate(total=Count('pk'), **expiry_bucket_counts(today))
+            count = stats['total']
+            statistics = {
+                'total': stats['total'],
+                'active': stats['active'],
+                'expired': stats['expired'],
+                'expiring_soon': stats['expiring_soon']
+            }
         
         return Response({
-            'count': total_count,
-            'statistics': {
-                'total': total_count,
-                'active': active_count,
-                'expired': expired_count,
-                'expiring_soon': expiring_soon_count
-            },
+            'count': count,
+            'next': paginator.get_next_link(),
+            'previous': paginator.get_previous_link(),
+            'statistics': statistics,
             'results': serializer.data
         })
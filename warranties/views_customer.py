@@ -4,7 +4,7 @@ CRUD operations for CustomerWarranty model
 """
 from rest_framework import viewsets, permissions, status
 from rest_framework.response import Response
-from rest_framework.parsers import MultiPartParser, FormParser
+from rest_framework.parsers import MultiPartParser, FormParser, JSONParser
 from .models import CustomerWarranty
 from .serializers import (
     CustomerWarrantySerializer,
@@ -23,7 +23,7 @@ class IsCustomerOwner(permissions.BasePermission):
     
     def has_object_permission(self, request, view, obj):
         # Only the owner can access their warranty
-        return obj.customer == request.user
+        return obj.customer_id == request.user.id
 
 
 class CustomerWarrantyViewSet(viewsets.ModelViewSet):
@@ -34,6 +34,13 @@ class CustomerWarrantyViewSet(viewsets.ModelViewSet):
     permission_classes = [IsCustomerOwner]
     parser_classes = [MultiPartParser, FormParser]  # For file upload
     
+    def get_parsers(self):
+        """Multipart parsing only for the writes that upload a file"""
+        # Called before self.action is resolved, so the HTTP method decides
+        if self.request.method in ('POST', 'PUT', 'PATCH'):
+            return super().get_parsers()
+        return [JSONParser()]
+    
     def get_queryset(self):
         """Return only warranties belonging to the current user"""
         return CustomerWarranty.objects.filter(customer=self.request.user)